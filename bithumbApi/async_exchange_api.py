@@ -0,0 +1,430 @@
+# asyncio 기반 bithumb 클라이언트 (exchange_api.bithumb / quotation_api 의 비동기 버전)
+import asyncio
+import json
+import re
+
+import pandas as pd
+
+from bithumbApi import exchange_api
+from bithumbApi import quotation_api
+from bithumbApi.async_request_api import _call_public_api, _send_get_request, _send_post_request, \
+    _send_delete_request, close_client_session
+from bithumbApi.signer import RequestSigner
+
+
+class AsyncBithumb:
+    """bithumb 클라이언트의 asyncio 버전
+
+        사용 예제:
+
+            >> async def main():
+                client = AsyncBithumb(access, secret)
+                prices = await asyncio.gather(*[client.get_current_price(t) for t in tickers])
+                await client.close()
+            >> asyncio.run(main())
+
+        주의 :
+
+           모든 인스턴스가 async_request_api 의 커넥션 풀과 rate_limiter 의 요청 수 제한을 공유한다.
+    """
+    # JWT 헤더 생성은 동기 클라이언트와 같은 구현을 사용
+    _request_headers = exchange_api.bithumb._request_headers
+    _signed = exchange_api.bithumb._signed
+
+    def __init__(self, access, secret):
+        self.access = access
+        self.secret = secret
+        self._signer = RequestSigner(access, secret)
+
+    async def close(self):
+        """공유 커넥션 풀 종료"""
+        await close_client_session()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    # region balance
+    async def get_balances(self, contain_req=False):
+        """
+        전체 계좌 조회
+        :param contain_req: Remaining-Req 포함여부
+        :return: 내가 보유한 자산 리스트
+        [contain_req == True 일 경우 Remaining-Req가 포함]
+        """
+        try:
+            url = "https://api.bithumb.com/v1/accounts"
+            query, headers = self._signed()
+            result = await _send_get_request(url, headers=headers)
+            if contain_req:
+                return result
+            else:
+                return result[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    async def _find_balance(self, ticker, contain_req, value):
+        """
+        잔고 목록에서 ticker 에 해당하는 항목을 찾아 value(item) 값을 리턴
+        :param ticker: 화폐를 의미하는 영문 대문자 코드
+        :param contain_req: Remaining-Req 포함여부
+        :param value: 잔고 항목을 받아 결과를 계산하는 함수
+        :return:
+        """
+        try:
+            # KRW-BTC
+            if '-' in ticker:
+                ticker = ticker.split('-')[1]
+
+            balances, req = await self.get_balances(contain_req=True)
+
+            result = 0
+            for x in balances:
+                if x['currency'] == ticker:
+                    result = value(x)
+                    break
+
+            if contain_req:
+                return result, req
+            else:
+                return result
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    async def get_balance(self, ticker="KRW", contain_req=False):
+        """
+        특정 코인/원화의 잔고를 조회하는 메소드
+        :param ticker: 화폐를 의미하는 영문 대문자 코드
+        :param contain_req: Remaining-Req 포함여부
+        :return: 주문가능 금액/수량 (주문 중 묶여있는 금액/수량 제외)
+        """
+        return await self._find_balance(ticker, contain_req, lambda x: float(x['balance']))
+
+    async def get_balance_t(self, ticker='KRW', contain_req=False):
+        """
+        특정 코인/원화의 잔고 조회(balance + locked)
+        :param ticker: 화폐를 의미하는 영문 대문자 코드
+        :param contain_req: Remaining-Req 포함여부
+        :return: 주문가능 금액/수량 (주문 중 묶여있는 금액/수량 포함)
+        """
+        return await self._find_balance(ticker, contain_req, lambda x: float(x['balance']) + float(x['locked']))
+
+    async def get_avg_buy_price(self, ticker='KRW', contain_req=False):
+        """
+        특정 코인/원화의 매수평균가 조회
+        :param ticker: 화폐를 의미하는 영문 대문자 코드
+        :param contain_req: Remaining-Req 포함여부
+        :return: 매수평균가
+        """
+        return await self._find_balance(ticker, contain_req, lambda x: float(x['avg_buy_price']))
+
+    async def get_amount(self, ticker, contain_req=False):
+        """
+        특정 코인/원화의 매수금액 조회
+        :param ticker: 화폐를 의미하는 영문 대문자 코드 (ALL 입력시 총 매수금액 조회)
+        :param contain_req: Remaining-Req 포함여부
+        :return: 매수금액
+        """
+        try:
+            # KRW-BTC
+            if '-' in ticker:
+                ticker = ticker.split('-')[1]
+
+            balances, req = await self.get_balances(contain_req=True)
+
+            amount = 0
+            for x in balances:
+                if x['currency'] == 'KRW':
+                    continue
+
+                avg_buy_price = float(x['avg_buy_price'])
+                balance = float(x['balance'])
+                locked = float(x['locked'])
+
+                if ticker == 'ALL':
+                    amount += avg_buy_price * (balance + locked)
+                elif x['currency'] == ticker:
+                    amount = avg_buy_price * (balance + locked)
+                    break
+            if contain_req:
+                return amount, req
+            else:
+                return amount
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    # endregion balance
+
+    # region chance
+    async def get_chance(self, ticker, contain_req=False):
+        """
+        마켓별 주문 가능 정보를 확인.
+        :param ticker:
+        :param contain_req: Remaining-Req 포함여부
+        :return: 마켓별 주문 가능 정보를 확인
+        """
+        try:
+            url = "https://api.bithumb.com/v1/orders/chance"
+            query, headers = self._signed({"market": ticker})
+            result = await _send_get_request(url + '?' + query, headers=headers, market=ticker)
+            if contain_req:
+                return result
+            else:
+                return result[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    # endregion chance
+
+    # region order
+    async def _post_order(self, requestBody, contain_req):
+        try:
+            url = "https://api.bithumb.com/v1/orders"
+            query, headers = self._signed(requestBody)
+            result = await _send_post_request(url, data=json.dumps(requestBody), headers=headers,
+                                              market=requestBody['market'])
+            if contain_req:
+                return result
+            else:
+                return result[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    async def buy_limit_order(self, ticker, price, volume, contain_req=False):
+        """
+        지정가 매수
+        :param ticker: 마켓 티커
+        :param price: 주문 가격
+        :param volume: 주문 수량
+        :param contain_req: Remaining-Req 포함여부
+        :return:
+        """
+        requestBody = dict(market=ticker, ord_type='limit', price=str(price), side='bid', volume=str(volume))
+        return await self._post_order(requestBody, contain_req)
+
+    async def sell_limit_order(self, ticker, price, volume, contain_req=False):
+        """
+        지정가 매도
+        :param ticker: 마켓 티커
+        :param price: 주문 가격
+        :param volume: 주문 수량
+        :param contain_req: Remaining-Req 포함여부
+        :return:
+        """
+        requestBody = dict(market=ticker, ord_type='limit', price=str(price), side='ask', volume=str(volume))
+        return await self._post_order(requestBody, contain_req)
+
+    async def buy_market_order(self, ticker, price, contain_req=False):
+        """
+        시장가 매수
+        :param ticker: ticker for cryptocurrency
+        :param price: KRW
+        :param contain_req: Remaining-Req 포함여부
+        :return:
+        """
+        requestBody = dict(market=ticker, side='bid', price=str(price), ord_type='price')
+        return await self._post_order(requestBody, contain_req)
+
+    async def sell_market_order(self, ticker, volume, contain_req=False):
+        """
+        시장가 매도 메서드
+        :param ticker: 가상화폐 티커
+        :param volume: 수량
+        :param contain_req: Remaining-Req 포함여부
+        :return:
+        """
+        requestBody = dict(market=ticker, side='ask', volume=str(volume), ord_type='market')
+        return await self._post_order(requestBody, contain_req)
+
+    async def cancel_order(self, uuid, contain_req=False):
+        """
+        주문 취소
+        :param uuid: 주문 함수의 리턴 값중 uuid
+        :param contain_req: Remaining-Req 포함여부
+        :return:
+        """
+        try:
+            url = "https://api.bithumb.com/v1/order"
+            query, headers = self._signed(dict(uuid=uuid))
+            result = await _send_delete_request(url + '?' + query, headers=headers)
+            if contain_req:
+                return result
+            else:
+                return result[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    async def get_order(self, ticker_or_uuid, state='wait', kind='watch', limit='100', contain_req=False):
+        """
+        주문 리스트 조회
+        :param ticker_or_uuid: market 또는 주문 uuid
+        :param state: 주문 상태(wait, done, cancel)
+        :param kind: 주문 유형(normal, watch)
+        :param limit: 요청개수, default =100
+        :param contain_req: Remaining-Req 포함여부
+        :return:
+        """
+        try:
+            p = re.compile(r"^\w+-\w+-\w+-\w+-\w+$")
+            if len(p.findall(ticker_or_uuid)) > 0:
+                return await self.get_individual_order(ticker_or_uuid, contain_req=contain_req)
+
+            url = "https://api.bithumb.com/v1/orders"
+            params = dict(market=ticker_or_uuid, state=state, kind=kind, limit=limit, page=1, order_by='desc')
+            query, headers = self._signed(params)
+            result = await _send_get_request(url + '?' + query, headers=headers, market=ticker_or_uuid)
+            if contain_req:
+                return result
+            else:
+                return result[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    async def get_individual_order(self, uuid, contain_req=False):
+        """
+        개별 주문 조회
+        :param uuid: 주문 id
+        :param contain_req: Remaining-Req 포함여부
+        :return:
+        """
+        try:
+            url = "https://api.bithumb.com/v1/order"
+            query, headers = self._signed({'uuid': uuid})
+            result = await _send_get_request(url + '?' + query, headers=headers)
+            if contain_req:
+                return result
+            else:
+                return result[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    # endregion order
+
+    # region quotation
+    async def get_tickersObj(self, fiat="ALL", limit_info=False):
+        """
+        마켓 코드 조회 (거래 가능한 마켓 목록 조회)
+        :param fiat: "ALL", "KRW", "BTC", "USDT"
+        :param limit_info: 요청수 제한 리턴
+        :return:
+        """
+        try:
+            url = "https://api.bithumb.com/v1/market/all"
+            contents, req_limit_info = await _call_public_api(url)
+
+            markets = contents
+            if fiat != "ALL":
+                markets = [x for x in contents if x["market"].startswith(fiat)]
+
+            if limit_info is False:
+                return markets
+            else:
+                return markets, req_limit_info
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    async def get_tickersEng(self, fiat="ALL", limit_info=False):
+        """
+        마켓 코드 조회 (영문 마켓 코드 목록)
+        :param fiat: "ALL", "KRW", "BTC", "USDT"
+        :param limit_info: 요청수 제한 리턴
+        :return:
+        """
+        ret = await self.get_tickersObj(fiat, limit_info=True)
+        if ret is None:
+            return None
+        markets, req_limit_info = ret
+        tickers = [x['market'] for x in markets]
+        if limit_info is False:
+            return tickers
+        else:
+            return tickers, req_limit_info
+
+    async def get_current_price(self, ticker="KRW-BTC"):
+        """
+        최종 체결 가격 조회 (현재가)
+        :param ticker: 티커 또는 티커 리스트
+        :return: 가격 (리스트로 요청하면 {티커: 가격} 딕셔너리)
+        """
+        try:
+            url = "https://api.bithumb.com/v1/ticker"
+            markets = ",".join(ticker) if isinstance(ticker, list) else ticker
+            contents = (await _call_public_api(url, markets=markets))[0]
+            if not contents:
+                return None
+
+            if isinstance(ticker, list):
+                return {content['market']: content['trade_price'] for content in contents}
+            else:
+                return contents[0]['trade_price']
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    async def get_orderbook(self, tickers="KRW-BTC"):
+        """
+        호가 정보 조회
+        :param tickers: 티커 또는 티커 리스트
+        :return:
+        """
+        try:
+            url = "https://api.bithumb.com/v1/orderbook"
+            markets = ",".join(tickers) if isinstance(tickers, list) else tickers
+            return (await _call_public_api(url, markets=markets))[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    async def get_ohlcv(self, ticker="KRW-BTC", interval="day", count=200, to=None):
+        """
+        캔들 조회
+        :param ticker: 마켓 티커
+        :param interval: day, minute1, minute3, ..., week, month
+        :param count: 캔들 개수
+        :param to: 마지막 캔들 시각 (미포함, tz 가 없으면 KST - quotation_api.get_ohlcv 와 같음)
+        :return: DataFrame
+        """
+        try:
+            url = quotation_api.get_url_ohlcv(interval=interval)
+
+            # KST 시각 epoch 초
+            to = quotation_api._to_kst(to)
+
+            dfs = []
+            for pos in range(max(count, 1), 0, -200):
+                contents = (await _call_public_api(url, market=ticker, count=min(200, pos),
+                                                   to=quotation_api._to_param(to)))[0]
+                df = quotation_api._candles_to_frame(contents)
+                if df.shape[0] == 0:
+                    break
+                dfs += [df]
+                to = int(df.index[0].value // 10 ** 9)
+
+            df = pd.concat(dfs).sort_index()
+            return df.rename(columns=quotation_api.OHLCV_COLUMNS)
+        except Exception as x:
+            print(x.__class__.__name__)
+            return None
+
+    # endregion quotation
+
+
+if __name__ == "__main__":
+    async def main():
+        async with AsyncBithumb(None, None) as client:
+            tickers = await client.get_tickersEng("KRW")
+            prices = await asyncio.gather(*[client.get_current_price(t) for t in tickers[:20]])
+            print(dict(zip(tickers[:20], prices)))
+
+    asyncio.run(main())
@@ -0,0 +1,173 @@
+# asyncio 기반 요청 함수 (request_api 의 비동기 버전)
+import asyncio
+from collections import namedtuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+from bithumbApi.errors import BithumbError, decode_error
+from bithumbApi.rate_limiter import get_rate_limiter
+from bithumbApi.request_api import DEFAULT_TIMEOUT, _parse_remaining_req, _request_market
+from bithumbApi.retry import get_retry_engine
+
+# 재시도 엔진에 넘기는 응답 (aiohttp 응답은 컨텍스트 밖에서 읽을 수 없으므로 필요한 값만 보관)
+_Response = namedtuple('_Response', ['status_code', 'headers', 'contents'])
+
+# 일시적 장애로 보는 예외 / 요청이 전송되지 않았음이 확실한 예외
+TRANSIENT_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+CONNECT_ERRORS = (aiohttp.ClientConnectorError,)
+
+_client_session = None
+_client_session_loop = None
+
+
+async def get_client_session(limit=50, keepalive_timeout=30.0, timeout=DEFAULT_TIMEOUT):
+    """
+    현재 이벤트 루프에서 공유하는 aiohttp 세션 (keep-alive 커넥션 풀)
+    :param limit: 최대 동시 커넥션 수
+    :param keepalive_timeout: 유휴 커넥션 유지 시간(초)
+    :param timeout: 요청 대기 시간(초) (연결, 응답) - 응답이 없으면 asyncio.TimeoutError 로 재시도
+    :return: aiohttp.ClientSession
+    """
+    global _client_session, _client_session_loop
+    loop = asyncio.get_running_loop()
+    if _client_session is None or _client_session.closed or _client_session_loop is not loop:
+        connector = aiohttp.TCPConnector(limit=limit, keepalive_timeout=keepalive_timeout)
+        connect, read = timeout
+        _client_session = aiohttp.ClientSession(connector=connector,
+                                                timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read))
+        _client_session_loop = loop
+    return _client_session
+
+
+async def close_client_session():
+    """
+    공유 aiohttp 세션 종료
+    """
+    global _client_session, _client_session_loop
+    if _client_session is not None and not _client_session.closed:
+        await _client_session.close()
+    _client_session = None
+    _client_session_loop = None
+
+
+async def _send_request(method, url, params=None, data=None, headers=None, market=None):
+    """
+    요청 수 제한, 우선순위, 재시도 정책을 지키면서 공유 세션으로 요청을 보낸다
+    :param method: GET, POST, DELETE
+    :param url:
+    :param params: 쿼리 파라미터
+    :param data: 요청 본문
+    :param headers: 헤더 딕셔너리 또는 시도할 때마다 새 헤더를 만드는 함수 (JWT nonce 재발급용)
+    :param market: 같은 우선순위 안에서 공정하게 나눌 마켓 코드 (None 이면 파라미터에서 찾음)
+    :return: 응답 본문, Remaining-Req 딕셔너리
+    """
+    limiter = get_rate_limiter()
+    group = limiter.group_for(method, url)
+    priority = limiter.priority_for(method, url)
+    market = _request_market(market, params, data)
+
+    async def attempt():
+        await limiter.acquire_async(group, priority, market)
+        session = await get_client_session()
+        req_headers = headers() if callable(headers) else headers
+        async with session.request(method, url, params=params, data=data, headers=req_headers) as resp:
+            try:
+                contents = await resp.json(content_type=None)
+            except ValueError:
+                contents = None
+            response = _Response(resp.status, resp.headers.copy(), contents)
+
+        remaining_req = response.headers.get('Remaining-Req')
+        if remaining_req is not None:
+            actual_group, min, sec = _parse_remaining_req(remaining_req)
+            limiter.update(group, actual_group, min, sec, method=method, url=url)
+        if response.status_code == 429:
+            limiter.penalize(group)
+        if response.status_code >= 400:
+            raise decode_error(response.status_code, response.contents, response.headers)
+        return response
+
+    # 주문 생성(POST)은 멱등이 아니므로 서버에 도달하지 않은 경우에만 재시도
+    response = await get_retry_engine().call_async((method, urlparse(url).path), attempt,
+                                                   idempotent=method != 'POST',
+                                                   transient_errors=TRANSIENT_ERRORS,
+                                                   connect_errors=CONNECT_ERRORS)
+
+    remaining_req_dict = {}
+    remaining_req = response.headers.get('Remaining-Req')
+    if remaining_req is not None:
+        group, min, sec = _parse_remaining_req(remaining_req)
+        remaining_req_dict['group'] = group
+        remaining_req_dict['min'] = min
+        remaining_req_dict['sec'] = sec
+    return response.contents, remaining_req_dict
+
+
+async def _call_public_api(url, **kwargs):
+    """
+
+    :param url:
+    :param kwargs:
+    :return:
+    """
+    try:
+        return await _send_request('GET', url, params=kwargs)
+    except BithumbError:
+        raise
+    except Exception as x:
+        print("It failed", x.__class__.__name__)
+        return None
+
+
+async def _send_get_request(url, headers=None, params=None, market=None):
+    """
+
+    :param url:
+    :param headers:
+    :param params:
+    :param market: 마켓 코드 (요청 스케줄링용)
+    :return:
+    """
+    try:
+        return await _send_request('GET', url, params=params, headers=headers, market=market)
+    except BithumbError:
+        raise
+    except Exception as x:
+        print("send get request failed", x.__class__.__name__)
+        return None
+
+
+async def _send_post_request(url, headers=None, data=None, market=None):
+    """
+
+    :param url:
+    :param headers:
+    :param data:
+    :param market: 마켓 코드 (요청 스케줄링용)
+    :return:
+    """
+    try:
+        return await _send_request('POST', url, data=data, headers=headers, market=market)
+    except BithumbError:
+        raise
+    except Exception as x:
+        print("send post request failed", x.__class__.__name__)
+        return None
+
+
+async def _send_delete_request(url, headers=None, params=None):
+    """
+
+    :param url:
+    :param headers:
+    :param params:
+    :return:
+    """
+    try:
+        return await _send_request('DELETE', url, params=params, headers=headers)
+    except BithumbError:
+        raise
+    except Exception as x:
+        print("send delete request failed", x.__class__.__name__)
+        return None
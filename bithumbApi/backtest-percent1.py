@@ -1,21 +1,9 @@
-import time
-import pandas as pd
-
 from bithumbApi import quotation_api
 
 
 def short_trading_for_1percent(ticker):
-    dfs = []
-    df = quotation_api.get_ohlcv(ticker, interval="minute1", to="20210607 00:00:00")
-    dfs.append(df)
-
-    for i in range(60):
-        df = quotation_api.get_ohlcv(ticker, interval="minute1", to=df.index[0])
-        dfs.append(df)
-        time.sleep(0.2)
-
-    df = pd.concat(dfs)
-    df = df.sort_index()
+    # 200개 x 61 페이지 (페이지는 동시에 조회)
+    df = quotation_api.get_ohlcv(ticker, interval="minute1", count=200 * 61, to="20210607 00:00:00")
 
     # df['close'].plot()
     # plt.show()
@@ -0,0 +1,334 @@
+# 캔들 로컬 저장소 (마켓/주기별 컬럼 파일)
+import atexit
+import logging
+import os
+import threading
+import time
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+# main.py 에서 프로그램 logger 로 교체 (단독으로 사용할 때는 모듈 logger)
+logger = logging.getLogger(__name__)
+
+# 저장 디렉토리
+CANDLE_STORE_DIR = 'candle_store'
+
+# 저장하는 캔들 필드 (컬럼 순서)
+CANDLE_FIELDS = ("opening_price", "high_price", "low_price", "trade_price",
+                 "candle_acc_trade_volume", "candle_acc_trade_price")
+
+_candle_values = itemgetter(*CANDLE_FIELDS)
+
+
+class Candles:
+    """시간순 캔들을 컬럼 배열로 보관하는 컨테이너
+
+        time   : int64 배열, KST 시각의 epoch 초
+        values : float64 (len(CANDLE_FIELDS), capacity) 배열, 행 순서는 CANDLE_FIELDS
+
+        사용 예제:
+
+            >> candles = Candles.from_contents(contents)     # 캔들 조회 응답 1페이지
+            >> candles.extend(next_contents)                  # 미리 잡아 둔 배열 뒤에 바로 디코딩
+            >> candles.normalize()                            # 시간순 정렬 + 같은 시각은 나중에 추가된 값만 남김
+            >> df = candles.between(start, stop).frame()      # 배열을 복사하지 않는 DataFrame
+
+        주의 :
+
+           extend 뒤에는 normalize 를 호출하기 전까지 시간순이 아닐 수 있다.
+           frame 이 리턴한 DataFrame 은 배열을 공유하므로 값을 바꾸면 컨테이너도 바뀐다.
+    """
+    def __init__(self, capacity=0):
+        self.time = np.empty(capacity, dtype=np.int64)
+        self.values = np.empty((len(CANDLE_FIELDS), capacity), dtype=np.float64)
+        self.size = 0
+
+    @classmethod
+    def from_arrays(cls, time, values):
+        """
+        :param time: int64 epoch 초 배열
+        :param values: (len(CANDLE_FIELDS), n) 배열
+        :return: Candles
+        """
+        candles = cls()
+        candles.time = np.asarray(time, dtype=np.int64)
+        candles.values = np.asarray(values, dtype=np.float64)
+        candles.size = candles.time.shape[0]
+        return candles
+
+    @classmethod
+    def from_contents(cls, contents):
+        """
+        캔들 조회 응답 1페이지를 시간순 컨테이너로 변환
+        :param contents: 캔들 조회 응답 리스트 (최신순)
+        :return: Candles
+        """
+        candles = cls(len(contents))
+        candles.extend(contents)
+        candles.normalize()
+        return candles
+
+    def __len__(self):
+        return self.size
+
+    def reserve(self, capacity):
+        """
+        capacity 개까지 다시 할당하지 않고 extend 할 수 있도록 배열을 늘림
+        :param capacity: 전체 캔들 수
+        """
+        if capacity <= self.time.shape[0]:
+            return
+        capacity = max(capacity, self.time.shape[0] * 2)
+        time = np.empty(capacity, dtype=np.int64)
+        values = np.empty((len(CANDLE_FIELDS), capacity), dtype=np.float64)
+        time[:self.size] = self.time[:self.size]
+        values[:, :self.size] = self.values[:, :self.size]
+        self.time, self.values = time, values
+
+    def extend(self, contents):
+        """
+        캔들 조회 응답을 배열 뒤에 디코딩
+        :param contents: 캔들 조회 응답 리스트
+        :return: 추가한 캔들 중 가장 이른 시각 (epoch 초, 없으면 None)
+        """
+        n = len(contents)
+        if n == 0:
+            return None
+        self.reserve(self.size + n)
+        start, stop = self.size, self.size + n
+        # "2021-06-07T00:00:00" 형식은 numpy 가 직접 파싱
+        self.time[start:stop] = np.array([x['candle_date_time_kst'] for x in contents],
+                                         dtype='datetime64[s]').astype(np.int64)
+        self.values[:, start:stop] = np.array([_candle_values(x) for x in contents], dtype=np.float64).T
+        self.size = stop
+        return int(self.time[start:stop].min())
+
+    def normalize(self):
+        """시간순으로 정렬하고 같은 시각은 마지막에 추가된 캔들만 남김"""
+        time = self.time[:self.size]
+        order = np.argsort(time, kind='stable')
+        time = time[order]
+        keep = np.ones(time.shape[0], dtype=bool)
+        keep[:-1] = time[1:] != time[:-1]
+        order = order[keep]
+        self.time = self.time[order]
+        self.values = self.values[:, order]
+        self.size = self.time.shape[0]
+
+    def between(self, start=None, stop=None):
+        """
+        [start, stop) 구간 캔들 (배열 복사 없음)
+        :param start: epoch 초 (포함)
+        :param stop: epoch 초 (미포함)
+        :return: Candles
+        """
+        time = self.time[:self.size]
+        lo = 0 if start is None else int(np.searchsorted(time, start, side='left'))
+        hi = self.size if stop is None else int(np.searchsorted(time, stop, side='left'))
+        return Candles.from_arrays(time[lo:hi], self.values[:, lo:hi])
+
+    def copy(self):
+        """
+        배열을 복사한 컨테이너 (저장소가 계속 사용하는 배열과 분리)
+        :return: Candles
+        """
+        return Candles.from_arrays(self.time[:self.size].copy(), self.values[:, :self.size].copy())
+
+    def tail(self, count):
+        """
+        마지막 count 개 캔들 (배열 복사 없음)
+        :param count: 캔들 개수
+        :return: Candles
+        """
+        start = max(self.size - count, 0)
+        return Candles.from_arrays(self.time[start:self.size], self.values[:, start:self.size])
+
+    def resample(self, minutes, offset=0):
+        """
+        더 긴 주기 캔들로 변환 (구간별 first/max/min/last/sum 을 한 번에 계산)
+        :param minutes: 만들 캔들 주기(분), 원본 주기의 배수
+        :param offset: 캔들 시작 시각 오프셋(분) (ex. 일봉을 09:00 에 시작하려면 540)
+        :return: Candles (시작 시각 기준)
+        """
+        if self.size == 0:
+            return Candles()
+        step, offset = minutes * 60, offset * 60
+        bucket = (self.time[:self.size] - offset) // step * step + offset
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        ends = np.r_[starts[1:], self.size] - 1
+        opening, high, low, trade, volume, price = self.values[:, :self.size]
+        values = np.stack([opening[starts], np.maximum.reduceat(high, starts), np.minimum.reduceat(low, starts),
+                           trade[ends], np.add.reduceat(volume, starts), np.add.reduceat(price, starts)])
+        return Candles.from_arrays(bucket[starts], values)
+
+    def frame(self, columns=CANDLE_FIELDS):
+        """
+        DataFrame 으로 보기 (배열 복사 없음)
+        :param columns: 컬럼명 (CANDLE_FIELDS 순서)
+        :return: DataFrame (KST 시각 index)
+        """
+        index = pd.DatetimeIndex(self.time[:self.size].view('datetime64[s]'))
+        return pd.DataFrame(self.values[:, :self.size].T, index=index, columns=list(columns), copy=False)
+
+
+def add_coverage(coverage, start, stop):
+    """
+    조회를 마친 구간 [start, stop) 을 추가하고 겹치거나 맞닿은 구간은 합침
+    :param coverage: [(start, stop), ...] 시간순 구간 리스트
+    :param start: 구간 시작 (포함)
+    :param stop: 구간 끝 (미포함)
+    :return: 새 구간 리스트
+    """
+    merged = []
+    for seg_start, seg_stop in sorted(list(coverage) + [(start, stop)]):
+        if merged and seg_start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], seg_stop))
+        else:
+            merged.append((seg_start, seg_stop))
+    return merged
+
+
+def find_coverage(coverage, t):
+    """
+    t 직전까지 조회가 끝난 구간 (start < t <= stop)
+    :param coverage: 구간 리스트
+    :param t: 시각
+    :return: (start, stop) 또는 None
+    """
+    for seg_start, seg_stop in coverage:
+        if seg_start < t <= seg_stop:
+            return seg_start, seg_stop
+    return None
+
+
+class CandleStore:
+    """마켓/주기별 캔들을 컬럼 단위 NumPy 파일(.npz)로 보관하는 저장소
+
+        파일 하나에 시각(epoch 초), CANDLE_FIELDS 컬럼, 그리고 API 로 조회를 마친 구간(coverage)을 저장한다.
+        coverage 안에서 비어 있는 시각은 거래가 없었던 캔들이므로 다시 조회하지 않는다.
+        파일은 처음 load 할 때 한 번만 읽어 메모리에 두고, save 는 메모리만 바꾼 뒤
+        flush_interval 초마다 (그리고 프로세스 종료 시 flush 로) 파일에 쓴다.
+
+        사용 예제:
+
+            >> store = get_candle_store()
+            >> with store.lock("KRW-BTC", "minutes1"):
+                candles, coverage = store.load("KRW-BTC", "minutes1")
+                store.save("KRW-BTC", "minutes1", candles, coverage)
+    """
+    def __init__(self, directory=CANDLE_STORE_DIR, flush_interval=60.0):
+        """
+        :param directory: 저장 디렉토리
+        :param flush_interval: 바뀐 캔들을 파일에 쓰는 최소 간격(초)
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.__lock = threading.Lock()
+        self.__locks = {}
+        self.__cached = {}      # (마켓, 주기) -> [Candles, coverage, 파일에 쓰지 않은 변경 여부, 마지막 저장 시각]
+
+    def _path(self, ticker, interval):
+        return os.path.join(self.directory, "{}_{}.npz".format(ticker, interval))
+
+    def lock(self, ticker, interval):
+        """
+        마켓/주기별 lock (같은 파일을 동시에 갱신하지 않도록)
+        :return: threading.Lock
+        """
+        with self.__lock:
+            lock = self.__locks.get((ticker, interval))
+            if lock is None:
+                lock = self.__locks[(ticker, interval)] = threading.Lock()
+            return lock
+
+    def load(self, ticker, interval):
+        """
+        저장된 캔들 읽기 (파일은 처음 한 번만 읽고 이후에는 메모리에 둔 값 사용)
+        :param ticker: 마켓 코드
+        :param interval: 캔들 주기 (ex. minutes1, days)
+        :return: Candles, 조회를 마친 구간 리스트 (epoch 초)
+        """
+        entry = self.__cached.get((ticker, interval))
+        if entry is None:
+            candles, coverage = self._read(ticker, interval)
+            entry = self.__cached[(ticker, interval)] = [candles, coverage, False, time.monotonic()]
+        return entry[0], list(entry[1])
+
+    def _read(self, ticker, interval):
+        path = self._path(ticker, interval)
+        try:
+            with np.load(path) as data:
+                candles = Candles.from_arrays(data['time'], np.stack([data[field] for field in CANDLE_FIELDS]))
+                coverage = [(int(start), int(stop)) for start, stop in data['coverage']]
+            return candles, coverage
+        except FileNotFoundError:
+            return Candles(), []
+        except Exception as x:
+            # 읽을 수 없는 파일은 다음 저장 때 덮어쓰지 않도록 옮겨 두고 빈 저장소로 다시 시작
+            logger.warning("candle store load failed: {} {}: {} (처음부터 다시 조회)".format(
+                path, x.__class__.__name__, x))
+            try:
+                os.replace(path, path + ".corrupt")
+            except OSError as e:
+                logger.warning("candle store move failed: {} {}".format(path, e))
+            return Candles(), []
+
+    def save(self, ticker, interval, candles, coverage, force=False):
+        """
+        캔들 저장 (메모리는 바로 바꾸고, 파일은 flush_interval 이 지났을 때만 씀)
+        :param ticker: 마켓 코드
+        :param interval: 캔들 주기
+        :param candles: 시간순 Candles
+        :param coverage: 조회를 마친 구간 리스트
+        :param force: True 이면 바로 파일에 씀
+        """
+        now = time.monotonic()
+        entry = self.__cached.get((ticker, interval))
+        written_at = entry[3] if entry is not None else 0.0
+        entry = self.__cached[(ticker, interval)] = [candles, list(coverage), True, written_at]
+        if force or now - written_at >= self.flush_interval:
+            self._write(ticker, interval, candles, coverage)
+            entry[2], entry[3] = False, now
+
+    def flush(self):
+        """파일에 쓰지 않은 변경을 모두 씀 (프로세스 종료 시 자동 호출)"""
+        for ticker, interval in list(self.__cached):
+            with self.lock(ticker, interval):
+                entry = self.__cached[(ticker, interval)]
+                if entry[2]:
+                    self._write(ticker, interval, entry[0], entry[1])
+                    entry[2], entry[3] = False, time.monotonic()
+
+    def _write(self, ticker, interval, candles, coverage):
+        """임시 파일에 쓴 뒤 교체"""
+        path = self._path(ticker, interval)
+        tmp = path + ".tmp.npz"
+        arrays = {field: candles.values[i, :candles.size] for i, field in enumerate(CANDLE_FIELDS)}
+        arrays['time'] = candles.time[:candles.size]
+        arrays['coverage'] = np.array(coverage, dtype=np.int64).reshape(-1, 2)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            np.savez(tmp, **arrays)
+            os.replace(tmp, path)
+        except Exception as x:
+            logger.warning("candle store save failed: {} {}: {}".format(path, x.__class__.__name__, x))
+
+
+_candle_store = None
+_candle_store_lock = threading.Lock()
+
+
+def get_candle_store():
+    """
+    프로세스 전체에서 공유하는 캔들 저장소
+    :return: CandleStore
+    """
+    global _candle_store
+    if _candle_store is None:
+        with _candle_store_lock:
+            if _candle_store is None:
+                _candle_store = CandleStore()
+                atexit.register(_candle_store.flush)
+    return _candle_store
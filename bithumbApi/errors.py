@@ -1,4 +1,20 @@
 class BithumbError(Exception):
+    # 같은 요청을 다시 보내면 성공할 수 있는 에러인지 여부
+    retryable = False
+
+    def __init__(self, message=None, name=None, status_code=None, headers=None):
+        """
+        :param message: 거래소가 보낸 에러 메시지
+        :param name: 거래소가 보낸 에러 코드 (ex. insufficient_funds_bid)
+        :param status_code: HTTP 상태 코드
+        :param headers: 응답 헤더 (Retry-After, Remaining-Req 참조용)
+        """
+        super().__init__(message)
+        self.message = message
+        self.name = name
+        self.status_code = status_code
+        self.headers = headers
+
     def __str__(self):
         return "bithumb Base Error"
 
@@ -59,6 +75,9 @@ class ExpiredAccessKey(BithumbError):
 
 
 class NonceUsed(BithumbError):
+    # nonce 를 새로 만들어 다시 보내면 되는 에러
+    retryable = True
+
     def __str__(self):
         return "이미 요청한 nonce값이 다시 사용되었습니다."
 
@@ -74,12 +93,74 @@ class OutOfScope(BithumbError):
 
 
 class TooManyRequests(BithumbError):
+    retryable = True
+
     def __str__(self):
         return "요청 수 제한을 초과했습니다."
 
 
-def raise_error(code):
-    if code == 429:
-        raise TooManyRequests()
-    else:
-        raise BithumbError()
\ No newline at end of file
+class ServerError(BithumbError):
+    # 처리 여부를 알 수 없으므로 멱등 요청만 재시도 (retry.RetryPolicy 참고)
+    retryable = True
+
+    def __str__(self):
+        return "거래소 서버 오류입니다."
+
+
+class CircuitOpen(BithumbError):
+    def __str__(self):
+        return "거래소 응답 장애로 요청을 잠시 차단했습니다."
+
+
+# 거래소 에러 응답의 error.name -> 예외 클래스
+ERROR_TYPES = {
+    'create_ask_error': CreateAskError,
+    'create_bid_error': CreateBidError,
+    'insufficient_funds_ask': InsufficientFundsAsk,
+    'insufficient_funds_bid': InsufficientFundsBid,
+    'under_min_total_ask': UnderMinTotalAsk,
+    'under_min_total_bid': UnderMinTotalBid,
+    'withdraw_address_not_registerd': WidthdrawAddressNotRegisterd,
+    'validation_error': ValidationError,
+    'invalid_query_payload': InvalidQueryPayload,
+    'jwt_verification': JwtVerification,
+    'expired_access_key': ExpiredAccessKey,
+    'nonce_used': NonceUsed,
+    'no_authorization_i_p': NoAutorizationIP,
+    'no_authorization_ip': NoAutorizationIP,
+    'out_of_scope': OutOfScope,
+    'too_many_requests': TooManyRequests,
+}
+
+
+def decode_error(code, contents=None, headers=None):
+    """
+    거래소 에러 응답을 예외 객체로 변환
+    :param code: HTTP 상태 코드
+    :param contents: 응답 본문 (ex. {"error": {"name": "under_min_total_bid", "message": "..."}})
+    :param headers: 응답 헤더
+    :return: BithumbError (하위 클래스) 객체
+    """
+    name = None
+    message = None
+    if isinstance(contents, dict):
+        error = contents.get('error')
+        if isinstance(error, dict):
+            name = error.get('name')
+            message = error.get('message')
+        else:
+            message = contents.get('message')
+
+    error_type = ERROR_TYPES.get(str(name).lower()) if name is not None else None
+    if error_type is None:
+        if code == 429:
+            error_type = TooManyRequests
+        elif code is not None and code >= 500:
+            error_type = ServerError
+        else:
+            error_type = BithumbError
+    return error_type(message, name=name, status_code=code, headers=headers)
+
+
+def raise_error(code, contents=None, headers=None):
+    raise decode_error(code, contents, headers)
@@ -1,82 +1,431 @@
-import jwt          # PyJWT
+import copy
 import json
+import math
 import re
-import uuid
+import threading
 import time
-import hashlib
-from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-import requests
-
-from bithumbApi.request_api import _send_get_request, _send_post_request, _send_delete_request
+from bithumbApi.request_api import _send_request, _parse_response, _send_get_request, _send_post_request, \
+    _send_delete_request
+from bithumbApi import errors, price_grid
+from bithumbApi.errors import BithumbError
+from bithumbApi.signer import RequestSigner
 
 logger = None
 
+# 거래소가 cancel_and_new(주문 정정) 를 지원하는지 여부 (None 이면 아직 모름)
+_cancel_and_new_supported = None
+
+# OrderRecord 가 남기는 주문 필드
+ORDER_FIELDS = ('uuid', 'side', 'ord_type', 'price', 'state', 'market', 'created_at', 'volume',
+                'remaining_volume', 'locked', 'executed_volume')
+
+# 숫자로 변환해서 보관하는 주문 필드
+ORDER_NUMBER_FIELDS = ('price', 'volume', 'remaining_volume', 'locked', 'executed_volume')
+
+# 완료(done/cancel)된 주문의 개별 조회 결과를 저장하는 파일
+ORDER_CACHE_FILE = 'order_cache.jsonl'
+
+# get_chance(마켓별 주문 규칙) 캐시 유지 시간(초)
+CHANCE_TTL = 60.0
+_chance_cache = {}          # (access key, 마켓) -> (get_chance 결과, 조회 시각)
+_chance_cache_lock = threading.Lock()
+
 # 원화 마켓 주문 가격 단위
 # https://docs.bithumb.com/docs/market-info-trade-price-detail
 def get_tick_size(price):
-    if price >= 2000000:
-        tick_size = round(price / 1000) * 1000
-    elif price >= 1000000:
-        tick_size = round(price / 500) * 500
-    elif price >= 500000:
-        tick_size = round(price / 100) * 100
-    elif price >= 100000:
-        tick_size = round(price / 50) * 50
-    elif price >= 10000:
-        tick_size = round(price / 10) * 10
-    elif price >= 1000:
-        tick_size = round(price / 5) * 5
-    elif price >= 100:
-        tick_size = round(price / 1) * 1
-    elif price >= 10:
-        tick_size = round(price / 0.1) / 10
-    else:
-        tick_size = round(price / 0.01) / 100
-    return tick_size
+    return price_grid.round_to_tick(price)
+
+
+# 원화 마켓 가격대별 호가 단위 (get_tick_size 와 같은 구간)
+def get_tick_unit(price):
+    return price_grid.tick_unit(price)
+
+
+def _format_number(value):
+    """API 응답과 같은 형식의 숫자 문자열 (ex. 700.0 -> "700", 0.0 -> "0", 0.5 -> "0.5")"""
+    return '{:.8f}'.format(value).rstrip('0').rstrip('.')
+
+
+class OrderRecord:
+    """주문 리스트 응답 1건을 ORDER_FIELDS 만 담아 보관하는 레코드
+
+        숫자 필드(ORDER_NUMBER_FIELDS)는 float 로, 원화 마켓 가격은 호가 번호(tick)로도 한 번만 변환해 둔다.
+        order['price'] 처럼 딕셔너리로도 읽을 수 있으며 이때 숫자 필드는 API 형식의 문자열로 돌려준다.
+
+        사용 예제:
+
+            >> order = OrderRecord.from_api(contents[0])
+            >> order.price, order.tick, order['price']
+            >> sorted(orders, key=lambda order: order.tick)
+            >> json.dump(orders, f, default=OrderRecord.to_dict)
+
+        주의 :
+
+           keep_raw=True 로 만들지 않으면 원본 응답은 보관하지 않는다. (raw 는 to_dict 결과)
+           tick 은 원화(KRW-) 마켓 호가 단위 기준이므로 다른 마켓 주문은 None 이다.
+    """
+    __slots__ = ORDER_FIELDS + ('tick', '_raw')
+
+    @classmethod
+    def from_api(cls, order, keep_raw=False):
+        """
+        :param order: 주문 리스트 응답 딕셔너리
+        :param keep_raw: True 이면 원본 응답도 보관
+        :return: OrderRecord
+        """
+        record = cls.__new__(cls)
+        for field in ORDER_FIELDS:
+            value = order.get(field)
+            if value is not None and field in ORDER_NUMBER_FIELDS:
+                value = float(value)
+            setattr(record, field, value)
+        krw = record.market is not None and record.market.startswith('KRW-')
+        record.tick = price_grid.price_to_tick(record.price) if krw and record.price is not None else None
+        record._raw = order if keep_raw else None
+        return record
+
+    def __getitem__(self, key):
+        if key not in ORDER_FIELDS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is not None and key in ORDER_NUMBER_FIELDS:
+            return _format_number(value)
+        return value
+
+    def __contains__(self, key):
+        return key in ORDER_FIELDS
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def keys(self):
+        return ORDER_FIELDS
+
+    def to_dict(self):
+        """
+        딕셔너리로 변환 (숫자 필드는 API 형식의 문자열)
+        :return: dict
+        """
+        return {field: self[field] for field in ORDER_FIELDS}
+
+    @property
+    def raw(self):
+        """원본 응답 (보관하지 않았으면 to_dict 결과)"""
+        return self._raw if self._raw is not None else self.to_dict()
+
+    def __repr__(self):
+        return "OrderRecord({})".format(self.to_dict())
+
+
+class AccountSnapshot:
+    """전체 계좌 조회(/v1/accounts) 결과를 짧은 시간 동안 공유하는 캐시
+
+        사용 예제:
+
+            >> snapshot = get_account_snapshot(access)
+            >> balances, by_currency, req = snapshot.get(fetch)
+            >> by_currency['KRW']['balance']
+
+        주의 :
+
+           지정가 주문은 debit() 으로 묶인 금액만 차감하고, 시장가 주문/취소, 체결 확인 후에는
+           invalidate() 로 캐시를 비워 다음 조회가 새 잔고를 받도록 한다.
+           같은 access key 를 쓰는 bithumb 객체는 모두 같은 스냅샷을 공유한다.
+    """
+    def __init__(self, ttl=1.0):
+        """
+        :param ttl: 조회 결과를 재사용할 시간(초)
+        """
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        self.__balances = None
+        self.__by_currency = {}
+        self.__req = {}
+        self.__fetched_at = 0.0
+        self.__generation = 0
+        self.__executed = {}        # 주문 uuid -> 마지막으로 확인한 체결 수량
+
+    def get(self, fetch):
+        """
+        캐시된 잔고를 리턴하고, 없거나 오래되었으면 fetch() 로 새로 조회
+        :param fetch: (잔고 리스트, Remaining-Req) 를 리턴하는 함수
+        :return: 잔고 리스트, 화폐 코드별 잔고 딕셔너리, Remaining-Req (조회 실패시 None)
+        """
+        with self.__lock:
+            if self.__balances is not None and time.monotonic() - self.__fetched_at < self.ttl:
+                return self.__balances, self.__by_currency, self.__req
+            generation = self.__generation
+
+        fetched_at = time.monotonic()
+        result = fetch()
+        if result is None:
+            return None
+        balances, req = result
+
+        by_currency = {x['currency']: x for x in balances}
+        with self.__lock:
+            # 조회 중에 무효화되었으면 이번 결과는 캐시하지 않음
+            if generation == self.__generation:
+                self.__balances = balances
+                self.__by_currency = by_currency
+                self.__req = req
+                self.__fetched_at = fetched_at
+        return balances, by_currency, req
+
+    def peek(self):
+        """
+        조회하지 않고 아직 유효한 캐시만 리턴
+        :return: 화폐 코드별 잔고 딕셔너리 (캐시가 없거나 오래되었으면 None)
+        """
+        with self.__lock:
+            if self.__balances is not None and time.monotonic() - self.__fetched_at < self.ttl:
+                return self.__by_currency
+            return None
+
+    def debit(self, currency, amount):
+        """
+        주문에 묶인 금액/수량만큼 캐시된 잔고를 차감 (캐시를 비우지 않고 다음 주문 검사에 사용)
+        :param currency: 화폐 코드
+        :param amount: 차감할 금액/수량
+        """
+        with self.__lock:
+            account = self.__by_currency.get(currency) if self.__balances is not None else None
+            if account is None:
+                return
+            # 이미 리턴한 리스트/딕셔너리는 바꾸지 않고 새로 만듦
+            account = dict(account,
+                           balance=str(float(account['balance']) - amount),
+                           locked=str(float(account.get('locked') or 0) + amount))
+            self.__by_currency = dict(self.__by_currency, **{currency: account})
+            self.__balances = [account if x['currency'] == currency else x for x in self.__balances]
+
+    def invalidate(self):
+        """캐시된 잔고를 버림 (주문 생성/취소, 체결 후 호출)"""
+        with self.__lock:
+            self.__balances = None
+            self.__generation += 1
+
+    def observe_orders(self, orders):
+        """
+        조회한 주문의 체결 수량이 늘었으면 캐시를 버림
+        :param orders: 주문 딕셔너리 또는 리스트
+        """
+        if isinstance(orders, dict):
+            orders = [orders]
+        filled = False
+        with self.__lock:
+            for order in orders:
+                uuid = order.get('uuid')
+                executed = order.get('executed_volume')
+                if uuid is None or executed is None:
+                    continue
+                if self.__executed.get(uuid, '0') != executed:
+                    self.__executed[uuid] = executed
+                    filled = filled or float(executed) > 0
+            if filled:
+                self.__balances = None
+                self.__generation += 1
+
+
+_account_snapshots = {}
+_account_snapshots_lock = threading.Lock()
+
+
+def get_account_snapshot(access, ttl=1.0):
+    """
+    access key 별로 공유하는 계좌 스냅샷
+    :param access: access key
+    :param ttl: 처음 생성할 때 사용할 캐시 유지 시간(초)
+    :return: AccountSnapshot
+    """
+    with _account_snapshots_lock:
+        snapshot = _account_snapshots.get(access)
+        if snapshot is None:
+            snapshot = _account_snapshots[access] = AccountSnapshot(ttl)
+        return snapshot
+
+
+class OrderCache:
+    """개별 주문 조회(/v1/order) 결과 캐시
+
+        done / cancel 상태의 주문은 더 이상 바뀌지 않으므로 메모리와 파일(filename)에 영구 보관하고,
+        wait 상태의 주문은 ttl 동안만 재사용한다.
+
+        사용 예제:
+
+            >> cache = get_order_cache()
+            >> order = cache.get(uuid)
+            >> if order is None:
+                cache.put(fetch(uuid))
+
+        주의 :
+
+           주문 취소/정정이나 주문 리스트 조회로 상태가 바뀐 것을 알게 되면 invalidate / observe 로 wait 주문을 버린다.
+    """
+    FINAL_STATES = ('done', 'cancel')
+
+    def __init__(self, filename=ORDER_CACHE_FILE, ttl=1.0):
+        """
+        :param filename: 완료된 주문을 저장할 파일 (None 이면 메모리에만 보관)
+        :param ttl: wait 주문을 재사용할 시간(초)
+        """
+        self.filename = filename
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        self.__orders = {}          # uuid -> (주문, 조회 시각) (완료된 주문은 조회 시각 None)
+        self.__loaded = False
+
+    def _load(self):
+        """파일에 저장된 완료 주문을 읽음 (lock 을 잡은 상태에서 호출)"""
+        self.__loaded = True
+        if self.filename is None:
+            return
+        try:
+            with open(self.filename, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        order = json.loads(line)
+                        self.__orders[order['uuid']] = (order, None)
+        except FileNotFoundError:
+            pass
+        except Exception as x:
+            print("order cache load failed", x.__class__.__name__)
+
+    def get(self, uuid):
+        """
+        :param uuid: 주문 uuid
+        :return: 캐시된 주문의 복사본 (없거나 만료되었으면 None)
+        """
+        with self.__lock:
+            if not self.__loaded:
+                self._load()
+            entry = self.__orders.get(uuid)
+            if entry is None:
+                return None
+            order, fetched_at = entry
+            if fetched_at is not None and time.monotonic() - fetched_at >= self.ttl:
+                del self.__orders[uuid]
+                return None
+            # 호출한 쪽에서 바꿔도 캐시가 바뀌지 않도록 복사해서 리턴
+            return copy.deepcopy(order)
+
+    def put(self, order):
+        """
+        조회한 주문 저장
+        :param order: /v1/order 응답
+        """
+        uuid = order.get('uuid') if isinstance(order, dict) else None
+        if uuid is None:
+            return
+        final = order.get('state') in OrderCache.FINAL_STATES
+        with self.__lock:
+            if not self.__loaded:
+                self._load()
+            previous = self.__orders.get(uuid)
+            self.__orders[uuid] = (copy.deepcopy(order), None if final else time.monotonic())
+            if final and self.filename is not None and (previous is None or previous[1] is not None):
+                try:
+                    with open(self.filename, 'a') as f:
+                        f.write(json.dumps(order) + '\n')
+                except Exception as x:
+                    print("order cache save failed", x.__class__.__name__)
+
+    def invalidate(self, uuid):
+        """
+        wait 주문 캐시를 버림 (주문 취소/정정 후 호출)
+        :param uuid: 주문 uuid
+        """
+        with self.__lock:
+            entry = self.__orders.get(uuid)
+            if entry is not None and entry[1] is not None:
+                del self.__orders[uuid]
+
+    def observe(self, orders):
+        """
+        주문 리스트 조회 결과와 상태/체결 수량이 다른 wait 주문 캐시를 버림
+        :param orders: 주문 리스트
+        """
+        with self.__lock:
+            for order in orders:
+                entry = self.__orders.get(order.get('uuid'))
+                if entry is None or entry[1] is None:
+                    continue
+                cached = entry[0]
+                if cached.get('state') != order.get('state') or \
+                        cached.get('executed_volume') != order.get('executed_volume'):
+                    del self.__orders[order['uuid']]
+
+
+_order_cache = None
+_order_cache_lock = threading.Lock()
+
+
+def get_order_cache():
+    """
+    프로세스 전체에서 공유하는 주문 조회 캐시
+    :return: OrderCache
+    """
+    global _order_cache
+    if _order_cache is None:
+        with _order_cache_lock:
+            if _order_cache is None:
+                _order_cache = OrderCache()
+    return _order_cache
+
+
+def _map_concurrently(fn, items, max_workers=8):
+    """
+    items 의 각 항목에 fn 을 동시에 적용 (요청 수 제한은 request_api 가 담당)
+    :param fn: 항목 1개를 처리하는 함수
+    :param items: 처리할 항목 리스트
+    :param max_workers: 동시에 실행할 최대 개수
+    :return: 입력 순서대로 fn 의 결과 또는 발생한 예외
+    """
+    def _run(item):
+        try:
+            return fn(item)
+        except Exception as x:
+            logger.info(x)
+            return x
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(_run, items))
 
 
 class bithumb:
     def __init__(self, access, secret):
         self.access = access
         self.secret = secret
+        self._signer = RequestSigner(access, secret)
+        self._accounts = get_account_snapshot(access)
+        self._orders = get_order_cache()
 
     def _request_headers(self, requestBody=None):
+        """
+        요청 헤더 생성 (서명은 RequestSigner 가 담당)
+        :param requestBody: 요청 파라미터
+        :return: Authorization 헤더가 포함된 딕셔너리
+        """
+        query, query_hash = self._signer.encode(requestBody)
+        return self._signer.headers(query_hash)
 
-        if requestBody is not None:
-            query = urlencode(requestBody).encode()
-            hash = hashlib.sha512()
-            hash.update(query)
-            query_hash = hash.hexdigest()
-            payload = {
-             'access_key': self.access,
-             'nonce': str(uuid.uuid4()),
-             'timestamp': round(time.time() * 1000),
-             'query_hash': query_hash,
-             'query_hash_alg': 'SHA512',
-            }
-        else:
-            payload = {
-             "access_key": self.access,
-             "nonce": str(uuid.uuid4()),
-             'timestamp': round(time.time() * 1000),
-            }
-
-        # if query is not None:
-        #     m = hashlib.sha512()
-        #     m.update(urlencode(query).encode(), algorithm="HS256")
-        #     query_hash = m.hexdigest()
-        #     payload['query_hash'] = query_hash
-        #     payload['query_hash_alg'] = "SHA512"
-
-        #jwt_token = jwt.encode(payload, self.secret, algorithm="HS256").decode('utf-8')
-        jwt_token = jwt.encode(payload, self.secret)     # PyJWT >= 2.0
-        authorization_token = 'Bearer {}'.format(jwt_token)
-        headers = {
-            'Authorization': authorization_token,
-            'Content-Type': 'application/json'
-        }
-        return headers
+    def _signed(self, params=None):
+        """
+        요청 파라미터를 한 번만 인코딩해서 전송할 쿼리와 헤더 생성 함수를 만든다
+        :param params: 요청 파라미터
+        :return: 쿼리 문자열, 시도할 때마다 새 헤더를 만드는 함수
+        """
+        query, query_hash = self._signer.encode(params)
+        return query, partial(self._signer.headers, query_hash)
 
     def get_myBalance(self, ticker="KRW", contain_req=False):
         """
@@ -92,38 +441,42 @@ class bithumb:
             if '-' in ticker:
                 ticker = ticker.split('-')[1]
 
-            balances, req = self.get_balances(contain_req=True)
-
-            # search the current currency
-            balance = []
-            for x in balances:
-                balance.append(x['currency'])
-
-            return balance
+            balances, by_currency, req = self._accounts.get(self._fetch_balances)
+            return list(by_currency)
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(balances)
+            logger.info(x)
             return None
 
     # region balance
+    def _fetch_balances(self):
+        url = "https://api.bithumb.com/v1/accounts"
+        query, headers = self._signed()
+        return _send_get_request(url, headers=headers, account=self.access)
+
+    def invalidate_balances(self):
+        """
+        계좌 스냅샷을 비워 다음 잔고 조회가 /v1/accounts 를 새로 요청하도록 함
+        (주문 생성/취소는 자동으로 호출, 그 외 체결을 확인한 경우 직접 호출)
+        """
+        self._accounts.invalidate()
+
     def get_balances(self, contain_req=False):
         """
-        전체 계좌 조회
+        전체 계좌 조회 (계좌 스냅샷 사용)
         :param contain_req: Remaining-Req 포함여부
         :return: 내가 보유한 자산 리스트
         [contain_req == True 일 경우 Remaining-Req가 포함]
         """
         try:
-            url = "https://api.bithumb.com/v1/accounts"
-            headers = self._request_headers()
-            result = _send_get_request(url, headers=headers)
+            balances, by_currency, req = self._accounts.get(self._fetch_balances)
             if contain_req:
-                return result
+                return balances, req
             else:
-                return result[0]
+                return balances
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(result)
+            logger.info(x)
             return None
 
     def get_balance(self, ticker="KRW", contain_req=False):
@@ -134,38 +487,25 @@ class bithumb:
         :return: 주문가능 금액/수량 (주문 중 묶여있는 금액/수량 제외)
         [contain_req == True 일 경우 Remaining-Req가 포함]
         """
-        retry_attempt = 0  # 재시도 횟수
-        max_retries = 1  # 최대 재시도 횟수
-        while retry_attempt <= max_retries:
-
-            try:
-                # fiat-ticker
-                # KRW-BTC
-                if '-' in ticker:
-                    ticker = ticker.split('-')[1]
-
-                balances, req = self.get_balances(contain_req=True)
-
-                # search the current currency
-                balance = 0
-                for x in balances:
-                    if x['currency'] == ticker:
-                        balance = float(x['balance'])
-                        break
-
-                if contain_req:
-                    return balance, req
-                else:
-                    return balance
-            except Exception as x:
-                if retry_attempt < max_retries:
-                    retry_attempt += 1
-                    print(f"get_balance Request failed. Retrying {retry_attempt}/{max_retries}...")
-                    time.sleep(3)  # 재시도 전 대기 시간 (필요시 조정 가능)
-                else:
-                    print(x.__class__.__name__)
-                    logger.info(balances)
-                    return None
+        try:
+            # fiat-ticker
+            # KRW-BTC
+            if '-' in ticker:
+                ticker = ticker.split('-')[1]
+
+            balances, by_currency, req = self._accounts.get(self._fetch_balances)
+
+            x = by_currency.get(ticker)
+            balance = float(x['balance']) if x is not None else 0
+
+            if contain_req:
+                return balance, req
+            else:
+                return balance
+        except Exception as x:
+            print(x.__class__.__name__)
+            logger.info(x)
+            return None
 
     def get_balance_t(self, ticker='KRW', contain_req=False):
         """
@@ -180,15 +520,14 @@ class bithumb:
             if '-' in ticker:
                 ticker = ticker.split('-')[1]
 
-            balances, req = self.get_balances(contain_req=True)
+            balances, by_currency, req = self._accounts.get(self._fetch_balances)
 
             balance = 0
             locked = 0
-            for x in balances:
-                if x['currency'] == ticker:
-                    balance = float(x['balance'])
-                    locked = float(x['locked'])
-                    break
+            x = by_currency.get(ticker)
+            if x is not None:
+                balance = float(x['balance'])
+                locked = float(x['locked'])
 
             if contain_req:
                 return balance + locked, req
@@ -196,7 +535,7 @@ class bithumb:
                 return balance + locked
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(balances)
+            logger.info(x)
             return None
 
     def get_avg_buy_price(self, ticker='KRW', contain_req=False):
@@ -212,13 +551,10 @@ class bithumb:
             if '-' in ticker:
                 ticker = ticker.split('-')[1]
 
-            balances, req = self.get_balances(contain_req=True)
+            balances, by_currency, req = self._accounts.get(self._fetch_balances)
 
-            avg_buy_price = 0
-            for x in balances:
-                if x['currency'] == ticker:
-                    avg_buy_price = float(x['avg_buy_price'])
-                    break
+            x = by_currency.get(ticker)
+            avg_buy_price = float(x['avg_buy_price']) if x is not None else 0
             if contain_req:
                 return avg_buy_price, req
             else:
@@ -226,7 +562,7 @@ class bithumb:
 
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(balances)
+            logger.info(x)
             return None
 
     def get_amount(self, ticker, contain_req=False):
@@ -242,7 +578,12 @@ class bithumb:
             if '-' in ticker:
                 ticker = ticker.split('-')[1]
 
-            balances, req = self.get_balances(contain_req=True)
+            balances, by_currency, req = self._accounts.get(self._fetch_balances)
+
+            if ticker != 'ALL':
+                # 특정 화폐는 바로 찾음
+                x = by_currency.get(ticker)
+                balances = [x] if x is not None else []
 
             amount = 0
             for x in balances:
@@ -264,7 +605,7 @@ class bithumb:
                 return amount
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(balances)
+            logger.info(x)
             return None
 
     # endregion balance
@@ -279,61 +620,172 @@ class bithumb:
         [contain_req == True 일 경우 Remaining-Req가 포함]
         """
         try:
-            url = "https://api.bithumb.com/v1/orders/chance"
-            data = {"market": ticker}
-            headers = self._request_headers(data)
-            result = _send_get_request(url, headers=headers, data=data)
+            # 수수료, 최소 주문 금액 같은 규칙은 자주 바뀌지 않으므로 CHANCE_TTL 동안 재사용
+            with _chance_cache_lock:
+                entry = _chance_cache.get((self.access, ticker))
+            if entry is not None and time.monotonic() - entry[1] < CHANCE_TTL:
+                result = entry[0], {}
+            else:
+                url = "https://api.bithumb.com/v1/orders/chance"
+                query, headers = self._signed({"market": ticker})
+                fetched_at = time.monotonic()
+                result = _send_get_request(url + '?' + query, headers=headers, account=self.access, market=ticker)
+                if result is not None:
+                    with _chance_cache_lock:
+                        _chance_cache[(self.access, ticker)] = result[0], fetched_at
             if contain_req:
                 return result
             else:
                 return result[0]
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(result)
+            logger.info(x)
+            return None
+
+    def _available_balances(self):
+        """
+        계좌 스냅샷의 화폐별 주문 가능 잔고 (주문마다 /v1/accounts 를 요청하지 않도록 유효한 캐시만 사용)
+        :return: {화폐 코드: 잔고} (캐시가 없거나 오래되었으면 None)
+        """
+        by_currency = self._accounts.peek()
+        if by_currency is None:
             return None
+        return {currency: float(x['balance']) for currency, x in by_currency.items()}
+
+    def _debit_order(self, ticker, side, price, volume):
+        """
+        전송한 지정가 주문에 묶인 금액/수량을 계좌 스냅샷에서 차감
+        :param ticker: 마켓 티커
+        :param side: bid(매수) / ask(매도)
+        :param price: 주문 가격
+        :param volume: 주문 수량
+        """
+        fiat, coin = ticker.split('-')
+        if side == 'bid':
+            chance = self.get_chance(ticker) or {}
+            fee = float(chance.get('bid_fee') or 0)
+            self._accounts.debit(fiat, float(price) * float(volume) * (1 + fee))
+        else:
+            self._accounts.debit(coin, float(volume))
+
+    def validate_order(self, ticker, side, price, volume, adjust=False, available=None):
+        """
+        지정가 주문을 보내기 전에 마켓 규칙(get_chance)과 계좌 스냅샷으로 검사
+        :param ticker: 마켓 티커
+        :param side: bid(매수) / ask(매도)
+        :param price: 주문 가격
+        :param volume: 주문 수량
+        :param adjust: True 이면 호가 단위에 맞지 않는 가격(매수는 내림, 매도는 올림)과
+                       소수점 8자리를 넘는 수량, 잔고보다 큰 수량을 보정
+        :param available: 화폐별 주문 가능 잔고 (None 이면 유효한 계좌 스냅샷이 있을 때만 잔고 검사,
+                          검사한 주문만큼 차감됨)
+        :return: 보정된 가격, 수량
+        [거래소가 거절할 주문이면 errors.CreateBidError/CreateAskError, UnderMinTotalBid/UnderMinTotalAsk,
+         InsufficientFundsBid/InsufficientFundsAsk 발생]
+        """
+        bid = side == 'bid'
+        price = float(price)
+        volume = float(volume)
+
+        chance = self.get_chance(ticker)
+        rule = {}
+        fee = 0.0
+        if chance:
+            rule = chance.get('market', {}).get(side) or {}
+            fee = float(chance.get('bid_fee' if bid else 'ask_fee') or 0)
+
+        # 호가 단위 (get_chance 에 없으면 원화 마켓만 호가 단위 표로 검사,
+        # 1원 미만 가격은 표보다 작은 단위를 쓰므로 다른 마켓처럼 거래소 검사에 맡김)
+        unit = rule.get('price_unit')
+        if not unit and ticker.startswith('KRW-') and price >= 1:
+            unit = get_tick_unit(price)
+        if unit:
+            unit = float(unit)
+            ticks = price / unit
+            if abs(ticks - round(ticks)) > 1e-6:
+                if not adjust:
+                    error = errors.CreateBidError if bid else errors.CreateAskError
+                    raise error("호가 단위에 맞지 않는 가격: " + str(price), name='invalid_price_unit')
+                ticks = math.floor(ticks) if bid else math.ceil(ticks)
+            price = round(round(ticks) * unit, 8)
+        if price == int(price):
+            price = int(price)
+
+        # 수량은 소수점 8자리까지 (이미 8자리인 값은 부동소수점 오차와 관계없이 그대로 사용)
+        if round(volume, price_grid.VOLUME_DECIMALS) != volume:
+            if not adjust:
+                raise errors.ValidationError("수량은 소수점 8자리까지 가능: " + str(volume), name='invalid_volume')
+            volume = price_grid.quantize_volume(volume)
+
+        # 잔고 (매수는 원화 + 수수료, 매도는 코인 수량)
+        if available is None:
+            available = self._available_balances() or {}
+        fiat, coin = ticker.split('-')
+        currency = fiat if bid else coin
+        have = available.get(currency)
+        need = price * volume * (1 + fee) if bid else volume
+        if have is not None and need > have + 1e-12:
+            if adjust:
+                volume = price_grid.quantize_volume(have / (price * (1 + fee)) if bid else have)
+                need = price * volume * (1 + fee) if bid else volume
+            if not adjust or volume <= 0:
+                error = errors.InsufficientFundsBid if bid else errors.InsufficientFundsAsk
+                raise error("주문 가능 잔고 부족: " + str(have), name='insufficient_funds_' + side)
+
+        # 최소 주문 금액
+        min_total = float(rule.get('min_total') or 0)
+        if price * volume < min_total:
+            error = errors.UnderMinTotalBid if bid else errors.UnderMinTotalAsk
+            raise error("최소 주문 금액 미만: " + str(price * volume), name='under_min_total_' + side)
+
+        if have is not None:
+            available[currency] = have - need
+        if volume == int(volume):
+            volume = int(volume)
+        return price, volume
 
     # endregion chance
 
     # region order
-    def buy_limit_order(self, ticker, price, volume, contain_req=False):
+    def buy_limit_order(self, ticker, price, volume, contain_req=False, adjust=False):
         """
         지정가 매수
         :param ticker: 마켓 티커
         :param price: 주문 가격
         :param volume: 주문 수량
         :param contain_req: Remaining-Req 포함여부
+        :param adjust: True 이면 호가 단위/수량/잔고에 맞게 보정해서 주문 (False 이면 맞지 않을 때 주문하지 않음)
         :return:
         """
-        attempt = 0  # 시도 횟수 카운터
-        max_retries = 1  # 재시도 횟수 설정 (예외 발생 시 1번 재시도)
+        try:
+            url = "https://api.bithumb.com/v1/orders"
+            # data = {"market": ticker,
+            #         "side": "bid",
+            #         "volume": str(volume),
+            #         "price": str(price),
+            #         "ord_type": "limit"}
+            # headers = self._request_headers(data)
+            # result = _send_post_request(url, headers=headers, data=data)
+            # 거래소가 거절할 주문은 요청 전에 걸러냄
+            price, volume = self.validate_order(ticker, 'bid', price, volume, adjust=adjust)
+            requestBody = dict(market=ticker, ord_type='limit', price=str(price), side='bid', volume=str(volume))
+            query, headers = self._signed(requestBody)
+            result = _send_post_request(url, data=json.dumps(requestBody), headers=headers, market=ticker)
+            if result is None:
+                # 전송 결과를 알 수 없으면 잔고를 새로 조회
+                self.invalidate_balances()
+            else:
+                self._debit_order(ticker, 'bid', price, volume)
 
-        while attempt <= max_retries:
-            try:
-                url = "https://api.bithumb.com/v1/orders"
-                # data = {"market": ticker,
-                #         "side": "bid",
-                #         "volume": str(volume),
-                #         "price": str(price),
-                #         "ord_type": "limit"}
-                # headers = self._request_headers(data)
-                # result = _send_post_request(url, headers=headers, data=data)
-                requestBody = dict(market=ticker, ord_type='limit', price=str(price), side='bid', volume=str(volume))
-                headers = self._request_headers(requestBody)
-                result = _send_post_request(url, data=json.dumps(requestBody), headers=headers)
-
-                if contain_req:
-                    return result
-                else:
-                    return result[0]
-            except Exception as x:
-                time.sleep(3)
-                attempt += 1
-                logger.info(result)
-
-                if attempt > max_retries:
-                    print(x.__class__.__name__)
-                    logger.info(result)
-                    return None
+            if contain_req:
+                return result
+            else:
+                return result[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            # 검사 에러는 __str__ 이 고정 문구이므로 상세 메시지를 남김
+            logger.info(getattr(x, 'message', None) or x)
+            return None
 
     def buy_market_order(self, ticker, price, contain_req=False):
         """
@@ -349,15 +801,16 @@ class bithumb:
                     "side": "bid",  # buy
                     "price": str(price),
                     "ord_type": "price"}
-            headers = self._request_headers(data)
-            result = _send_post_request(url, headers=headers, data=data)
+            query, headers = self._signed(data)
+            result = _send_post_request(url, headers=headers, data=json.dumps(data), market=ticker)
+            self.invalidate_balances()
             if contain_req:
                 return result
             else:
                 return result[0]
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(result)
+            logger.info(x)
             return None
 
     def sell_market_order(self, ticker, volume, contain_req=False):
@@ -374,55 +827,104 @@ class bithumb:
                     "side": "ask",  # sell
                     "volume": str(volume),
                     "ord_type": "market"}
-            headers = self._request_headers(data)
-            result = _send_post_request(url, headers=headers, data=data)
+            query, headers = self._signed(data)
+            result = _send_post_request(url, headers=headers, data=json.dumps(data), market=ticker)
+            self.invalidate_balances()
             if contain_req:
                 return result
             else:
                 return result[0]
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(result)
+            logger.info(x)
             return None
 
-    def sell_limit_order(self, ticker, price, volume, contain_req=False):
+    def sell_limit_order(self, ticker, price, volume, contain_req=False, adjust=False):
         """
         지정가 매도
         :param ticker: 마켓 티커
         :param price: 주문 가격
         :param volume: 주문 수량
         :param contain_req: Remaining-Req 포함여부
+        :param adjust: True 이면 호가 단위/수량/잔고에 맞게 보정해서 주문 (False 이면 맞지 않을 때 주문하지 않음)
         :return:
         """
-        attempt = 0  # 시도 횟수 카운터
-        max_retries = 1  # 재시도 횟수 설정 (예외 발생 시 1번 재시도)
+        try:
+            url = "https://api.bithumb.com/v1/orders"
+            # data = {"market": ticker,
+            #         "side": "ask",
+            #         "volume": str(volume),
+            #         "price": str(price),
+            #         "ord_type": "limit"}
+            # 거래소가 거절할 주문은 요청 전에 걸러냄
+            price, volume = self.validate_order(ticker, 'ask', price, volume, adjust=adjust)
+            requestBody = dict(market=ticker, ord_type='limit', price=str(price), side='ask', volume=str(volume))
+            query, headers = self._signed(requestBody)
+
+            result = _send_post_request(url, data=json.dumps(requestBody), headers=headers, market=ticker)
+            if result is None:
+                # 전송 결과를 알 수 없으면 잔고를 새로 조회
+                self.invalidate_balances()
+            else:
+                self._debit_order(ticker, 'ask', price, volume)
 
-        while attempt <= max_retries:
-            try:
-                url = "https://api.bithumb.com/v1/orders"
-                # data = {"market": ticker,
-                #         "side": "ask",
-                #         "volume": str(volume),
-                #         "price": str(price),
-                #         "ord_type": "limit"}
-                requestBody = dict(market=ticker, ord_type='limit', price=str(price), side='ask', volume=str(volume))
-                headers = self._request_headers(requestBody)
-
-                result = _send_post_request(url, data=json.dumps(requestBody), headers=headers)
-
-                if contain_req:
-                    return result
-                else:
-                    return result[0]
-            except Exception as x:
-                time.sleep(3)
-                attempt += 1
-                logger.info(result)
-
-                if attempt > max_retries:
-                    print(x.__class__.__name__)
-                    logger.info(result)
-                    return None
+            if contain_req:
+                return result
+            else:
+                return result[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            # 검사 에러는 __str__ 이 고정 문구이므로 상세 메시지를 남김
+            logger.info(getattr(x, 'message', None) or x)
+            return None
+
+    def _place_order(self, requestBody):
+        """
+        주문 1건 전송 (실패하면 예외를 그대로 발생)
+        :param requestBody: 주문 파라미터
+        :return: 주문 결과, Remaining-Req 딕셔너리
+        """
+        url = "https://api.bithumb.com/v1/orders"
+        query, headers = self._signed(requestBody)
+        resp = _send_request('POST', url, headers=headers, data=json.dumps(requestBody), market=requestBody['market'])
+        return _parse_response(resp)
+
+    def place_orders(self, specs, max_workers=8, validate=True, adjust=False):
+        """
+        여러 건의 지정가 주문을 동시에 전송 (요청 수 제한 안에서 최대한 빠르게)
+        :param specs: 주문 리스트 [{'market': 'KRW-XRP', 'side': 'bid', 'price': 100, 'volume': 20}, ...]
+                      (ord_type 을 지정하지 않으면 limit)
+        :param max_workers: 동시에 전송할 최대 주문 수
+        :param validate: True 이면 전송 전에 validate_order 로 검사 (앞 주문이 사용할 잔고를 차감하며 검사)
+        :param adjust: True 이면 검사할 때 호가 단위/수량/잔고에 맞게 보정
+        :return: 입력 순서대로 주문 결과 딕셔너리(uuid 포함) 또는 실패한 주문의 예외(errors.BithumbError 등)
+        """
+        results = [None] * len(specs)
+        requestBodies = []
+        available = self._available_balances() if validate and specs else None
+        for index, spec in enumerate(specs):
+            ord_type = spec.get('ord_type', 'limit')
+            price, volume = spec['price'], spec['volume']
+            if validate and ord_type == 'limit':
+                try:
+                    price, volume = self.validate_order(spec['market'], spec['side'], price, volume, adjust=adjust,
+                                                        available=available if available is not None else {})
+                except BithumbError as x:
+                    logger.info(x.message or x)
+                    results[index] = x
+                    continue
+            requestBodies.append((index, dict(market=spec['market'], ord_type=ord_type, price=str(price),
+                                              side=spec['side'], volume=str(volume))))
+
+        placed = _map_concurrently(lambda item: self._place_order(item[1])[0], requestBodies, max_workers)
+        for (index, requestBody), result in zip(requestBodies, placed):
+            results[index] = result
+            if requestBody['ord_type'] == 'limit' and not isinstance(result, Exception):
+                self._debit_order(requestBody['market'], requestBody['side'], requestBody['price'], requestBody['volume'])
+            else:
+                # 시장가 주문이나 결과를 알 수 없는 주문은 잔고를 새로 조회
+                self.invalidate_balances()
+        return results
 
     def cancel_order(self, uuid1, contain_req=False):
         """
@@ -438,37 +940,129 @@ class bithumb:
             #headers = self._request_headers(data)
             #result = _send_delete_request(url, headers=headers, data=data)
             # Set API parameters
-            data = dict(uuid=uuid1)
-
-            # Generate access token
-            query = urlencode(data).encode()
-            hash = hashlib.sha512()
-            hash.update(query)
-            query_hash = hash.hexdigest()
-            payload = {
-                'access_key': self.access,
-                'nonce': str(uuid.uuid4()),
-                'timestamp': round(time.time() * 1000),
-                'query_hash': query_hash,
-                'query_hash_alg': 'SHA512',
-            }
-            jwt_token = jwt.encode(payload, self.secret)
-            authorization_token = 'Bearer {}'.format(jwt_token)
-            headers = {
-                'Authorization': authorization_token
-            }
-            # result = _send_delete_request(url, headers=headers, data=data)
-            result = requests.delete(url, params=data, headers=headers)
-            #result = _send_delete_request(url, headers=headers, data=data)
+            query, headers = self._signed(dict(uuid=uuid1))
+            result = _send_delete_request(url + '?' + query, headers=headers)
+            self.invalidate_balances()
+            self._orders.invalidate(uuid1)
+
+            if contain_req:
+                return result
+            else:
+                return result[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            logger.info(x)
+            return None
+
+    def _cancel_order(self, uuid):
+        """
+        주문 1건 취소 (실패하면 예외를 그대로 발생)
+        :param uuid: 주문 uuid
+        :return: 취소된 주문 정보, Remaining-Req 딕셔너리
+        """
+        url = "https://api.bithumb.com/v1/order"
+        query, headers = self._signed(dict(uuid=uuid))
+        result = _parse_response(_send_request('DELETE', url + '?' + query, headers=headers))
+        self._orders.invalidate(uuid)
+        return result
+
+    def cancel_orders(self, uuids, max_workers=8):
+        """
+        여러 건의 주문을 동시에 취소 (요청 수 제한 안에서 최대한 빠르게)
+        :param uuids: 취소할 주문 uuid 리스트
+        :param max_workers: 동시에 전송할 최대 취소 요청 수
+        :return: 입력 순서대로 취소 결과 딕셔너리 또는 실패한 취소의 예외, 화폐별 해제된 금액/수량 딕셔너리
+        """
+        try:
+            results = _map_concurrently(lambda uuid: self._cancel_order(uuid)[0], list(uuids), max_workers)
+        finally:
+            self.invalidate_balances()
+
+        # 매수 취소는 원화, 매도 취소는 코인이 주문 가능 잔고로 돌아옴
+        freed = {}
+        for result in results:
+            if not isinstance(result, dict) or '-' not in result.get('market', ''):
+                continue
+            fiat, coin = result['market'].split('-')
+            currency = fiat if result.get('side') == 'bid' else coin
+            freed[currency] = freed.get(currency, 0) + float(result.get('locked') or 0)
+        return results, freed
+
+    def amend_order(self, uuid, price=None, volume=None, contain_req=False):
+        """
+        대기 주문의 가격/수량 변경 (취소 후 재주문)
+        거래소의 cancel_and_new 를 먼저 사용하고, 지원하지 않으면 취소 직후 바로 새 주문을 보낸다
+        :param uuid: 변경할 주문 uuid
+        :param price: 새 주문 가격 (None 이면 기존 가격)
+        :param volume: 새 주문 수량 (None 이면 기존 주문의 미체결 수량)
+        :param contain_req: Remaining-Req 포함여부
+        :return: 새 주문 정보 (prev_order_uuid: 취소된 주문, new_order_uuid: 새 주문)
+        """
+        global _cancel_and_new_supported
+        try:
+            result = None
+            if _cancel_and_new_supported is not False:
+                url = "https://api.bithumb.com/v1/orders/cancel_and_new"
+                requestBody = dict(prev_order_uuid=uuid, new_ord_type='limit',
+                                   new_price=str(price) if price is not None else None,
+                                   new_volume=str(volume) if volume is not None else 'remain_only')
+                requestBody = {key: value for key, value in requestBody.items() if value is not None}
+                query, headers = self._signed(requestBody)
+                try:
+                    resp = _send_request('POST', url, headers=headers, data=json.dumps(requestBody))
+                    _cancel_and_new_supported = True
+                    self._orders.invalidate(uuid)
+                    result = _parse_response(resp)
+                    result[0].setdefault('prev_order_uuid', uuid)
+                except BithumbError as x:
+                    # 405 이거나 주문 에러(ex. order_not_found)가 아닌 404 만 엔드포인트가 없는 것으로 판단
+                    missing = x.status_code == 405 or (x.status_code == 404 and 'order' not in str(x.name or '').lower())
+                    if not missing:
+                        raise
+                    # 엔드포인트가 없으면 이후에는 바로 취소 + 재주문 사용
+                    _cancel_and_new_supported = False
+
+            if result is None:
+                canceled, req = self._cancel_order(uuid)
+                requestBody = dict(market=canceled['market'], ord_type='limit',
+                                   price=str(price if price is not None else canceled['price']),
+                                   side=canceled['side'],
+                                   volume=str(volume if volume is not None else canceled['remaining_volume']))
+                order, req = self._place_order(requestBody)
+                order = dict(order, prev_order_uuid=uuid, new_order_uuid=order.get('uuid'))
+                result = order, req
+            self.invalidate_balances()
 
             if contain_req:
                 return result
             else:
                 return result[0]
+        except Exception as x:
+            # 취소만 되고 재주문이 실패했을 수 있으므로 잔고는 다시 조회
+            self.invalidate_balances()
+            print(x.__class__.__name__)
+            logger.info(x)
+            return None
+
+    def cancel_all(self, ticker, side=None, max_workers=8):
+        """
+        마켓의 대기 주문을 모두 취소
+        :param ticker: 마켓 티커
+        :param side: bid(매수) / ask(매도) 만 취소할 경우 지정, None 이면 전체
+        :param max_workers: 동시에 전송할 최대 취소 요청 수
+        :return: 취소한 주문 uuid 리스트, 입력 순서대로 취소 결과, 화폐별 해제된 금액/수량 딕셔너리
+                 (대기 주문 조회 실패시 None)
+        """
+        try:
+            # 대기 주문이 100개를 넘어도 모두 취소하도록 전체 페이지 조회
+            uuids = [order['uuid'] for order in self.iter_orders(ticker, 'wait', 'watch')
+                     if side is None or order['side'] == side]
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(result)
+            logger.info(x)
             return None
+        results, freed = self.cancel_orders(uuids, max_workers)
+        return uuids, results, freed
 
     def get_order(self, ticker_or_uuid, state='wait', kind='watch', limit='100', contain_req=False):
         """
@@ -481,56 +1075,92 @@ class bithumb:
         :return:
         """
 
-        attempt = 0
-        max_retries = 1
-
-        while attempt <= max_retries:
-
-            # TODO : states, identifiers 관련 기능 추가 필요
-            try:
-                p = re.compile(r"^\w+-\w+-\w+-\w+-\w+$")
-                # 정확히는 입력을 대문자로 변환 후 다음 정규식을 적용해야 함
-                # - r"^[0-9A-F]{8}-[0-9A-F]{4}-4[0-9A-F]{3}-[89AB][0-9A-F]{3}-[0-9A-F]{12}$"
-                is_uuid = len(p.findall(ticker_or_uuid)) > 0
-                if is_uuid:
-                    url = "https://api.bithumb.com/v1/order"
-                    data = {'uuid': ticker_or_uuid}
-                    headers = self._request_headers(data)
-                    result = _send_get_request(url, headers=headers, data=data)
-                else :
-                    url = "https://api.bithumb.com/v1/orders"
-                    # data = {'market': ticker_or_uuid,
-                    #         'state': state,
-                    #         'kind': kind,
-                    #         'limit': limit,
-                    #         'order_by': 'desc'
-                    #         }
-                    try:
-                        headers = self._request_headers()
-                        param = dict(market=ticker_or_uuid, state=state, kind=kind, limit=limit, page=1, order_by='desc')
-                        query = urlencode(param)
-                        result = _send_get_request(url, headers=headers, data=query)
-                    except requests.ConnectionError as e:
-                        logger.error(f"ConnectionError occurred: {e}")
-                        time.sleep(3)
-                        attempt += 1
-                        if attempt > max_retries:
-                            logger.error("Max retries reached. Unable to connect.")
-                            return None
-
-                if contain_req:
-                    return result
-                else:
-                    return result[0]
-            except Exception as x:
-                time.sleep(3)
-                attempt += 1
-                logger.info(result)
-
-                if attempt > max_retries:
-                    print(x.__class__.__name__)
-                    logger.info(result)
-                    return None
+        # TODO : states, identifiers 관련 기능 추가 필요
+        try:
+            p = re.compile(r"^\w+-\w+-\w+-\w+-\w+$")
+            # 정확히는 입력을 대문자로 변환 후 다음 정규식을 적용해야 함
+            # - r"^[0-9A-F]{8}-[0-9A-F]{4}-4[0-9A-F]{3}-[89AB][0-9A-F]{3}-[0-9A-F]{12}$"
+            is_uuid = len(p.findall(ticker_or_uuid)) > 0
+            if is_uuid:
+                return self.get_individual_order(ticker_or_uuid, contain_req=contain_req)
+            else :
+                url = "https://api.bithumb.com/v1/orders"
+                # data = {'market': ticker_or_uuid,
+                #         'state': state,
+                #         'kind': kind,
+                #         'limit': limit,
+                #         'order_by': 'desc'
+                #         }
+                param = dict(market=ticker_or_uuid, state=state, kind=kind, limit=limit, page=1, order_by='desc')
+                query, headers = self._signed(param)
+                result = _send_get_request(url + '?' + query, headers=headers, account=self.access,
+                                           market=ticker_or_uuid)
+
+            # 체결 수량이 바뀐 주문이 있으면 계좌 스냅샷 / 주문 캐시 무효화
+            self._accounts.observe_orders(result[0])
+            self._orders.observe(result[0])
+
+            if contain_req:
+                return result
+            else:
+                return result[0]
+        except Exception as x:
+            print(x.__class__.__name__)
+            logger.info(x)
+            return None
+
+    def _fetch_orders_page(self, ticker, state, kind, limit, page, order_by):
+        """
+        주문 리스트 1페이지 조회
+        :return: 주문 리스트 (조회 실패시 예외를 그대로 발생, 빈 페이지와 구분하기 위해 None 을 리턴하지 않음)
+        """
+        url = "https://api.bithumb.com/v1/orders"
+        param = dict(market=ticker, state=state, kind=kind, limit=limit, page=page, order_by=order_by)
+        query, headers = self._signed(param)
+        result = _parse_response(_send_request('GET', url + '?' + query, headers=headers, market=ticker))
+        self._accounts.observe_orders(result[0])
+        self._orders.observe(result[0])
+        return result[0]
+
+    def iter_orders(self, ticker, state='wait', kind='watch', limit=100, until=None, record=True,
+                    order_by='desc', keep_raw=False):
+        """
+        주문 리스트를 페이지 단위로 필요한 만큼만 조회하는 generator
+        현재 페이지를 처리하는 동안 다음 페이지를 미리 요청한다
+        :param ticker: market
+        :param state: 주문 상태(wait, done, cancel)
+        :param kind: 주문 유형(normal, watch)
+        :param limit: 페이지당 요청개수 (최대 100)
+        :param until: 주문을 받아 True 를 리턴하면 그 주문까지만 리턴하고 조회 중단
+        :param record: True 이면 OrderRecord (ORDER_FIELDS 만 보관), False 이면 응답 딕셔너리 그대로
+        :param order_by: 정렬 (asc, desc)
+        :param keep_raw: record 가 True 일 때 원본 응답도 보관 (파일에 응답 필드 전체를 저장하는 경우)
+        :return: OrderRecord 또는 주문 딕셔너리
+        [페이지 조회에 실패하면 예외 발생 (일부만 받은 목록을 전체로 오인하지 않도록)]
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            page = 1
+            future = executor.submit(self._fetch_orders_page, ticker, state, kind, limit, page, order_by)
+            while future is not None:
+                orders = future.result()
+                # 빈 페이지에서만 종료 (조회 실패는 future.result() 가 예외를 다시 발생시킴)
+                if len(orders) == 0:
+                    return
+                future = None
+                if len(orders) >= int(limit):
+                    # 마지막 페이지가 아니면 다음 페이지를 미리 요청
+                    page += 1
+                    future = executor.submit(self._fetch_orders_page, ticker, state, kind, limit, page, order_by)
+
+                for order in orders:
+                    if record:
+                        order = OrderRecord.from_api(order, keep_raw)
+                    yield order
+                    if until is not None and until(order):
+                        return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def get_individual_order(self, uuid, contain_req=False):
         """
@@ -541,18 +1171,35 @@ class bithumb:
         """
         # TODO : states, uuids, identifiers 관련 기능 추가 필요
         try:
-            url = "https://api.bithumb.com/v1/order"
-            data = {'uuid': uuid}
-            headers = self._request_headers(data)
-            result = _send_get_request(url, headers=headers, data=data)
+            order = self._orders.get(uuid)
+            if order is not None:
+                # 캐시에서 리턴하는 경우 Remaining-Req 는 비어 있음
+                result = order, {}
+            else:
+                url = "https://api.bithumb.com/v1/order"
+                query, headers = self._signed({'uuid': uuid})
+                result = _send_get_request(url + '?' + query, headers=headers, account=self.access)
+                self._accounts.observe_orders(result[0])
+                self._orders.put(result[0])
             if contain_req:
                 return result
             else:
                 return result[0]
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(result)
+            logger.info(x)
             return None
+
+    def get_individual_orders(self, uuids, max_workers=8):
+        """
+        여러 주문을 한 번에 조회 (캐시에 없는 주문만 동시에 요청)
+        주문 리스트 API 는 체결 내역(trades)을 주지 않으므로 개별 조회를 병렬로 보낸다
+        :param uuids: 주문 uuid 리스트
+        :param max_workers: 동시에 전송할 최대 요청 수
+        :return: 입력 순서대로 주문 딕셔너리 (조회 실패시 None)
+        """
+        return [order if isinstance(order, dict) else None
+                for order in _map_concurrently(self.get_individual_order, list(uuids), max_workers)]
     # endregion order
 
     def withdraw_coin(self, currency, amount, address, secondary_address='None', transaction_type='default', contain_req=False):
@@ -573,15 +1220,16 @@ class bithumb:
                     "address": address,
                     "secondary_address": secondary_address,
                     "transaction_type": transaction_type}
-            headers = self._request_headers(data)
-            result = _send_post_request(url, headers=headers, data=data)
+            query, headers = self._signed(data)
+            result = _send_post_request(url, headers=headers, data=json.dumps(data))
+            self.invalidate_balances()
             if contain_req:
                 return result
             else:
                 return result[0]
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(result)
+            logger.info(x)
             return None
 
     def withdraw_cash(self, amount: str, contain_req=False):
@@ -594,15 +1242,16 @@ class bithumb:
         try:
             url = "https://api.bithumb.com/v1/withdraws/krw"
             data = {"amount": amount}
-            headers = self._request_headers(data)
-            result = _send_post_request(url, headers=headers, data=data)
+            query, headers = self._signed(data)
+            result = _send_post_request(url, headers=headers, data=json.dumps(data))
+            self.invalidate_balances()
             if contain_req:
                 return result
             else:
                 return result[0]
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(result)
+            logger.info(x)
             return None
 
     def get_individual_withdraw_order(self, uuid: str, currency: str, contain_req=False):
@@ -616,16 +1265,15 @@ class bithumb:
         """
         try:
             url = "https://api.bithumb.com/v1/withdraw"
-            data = {"uuid": uuid, "currency": currency}
-            headers = self._request_headers(data)
-            result = _send_get_request(url, headers=headers, data=data)
+            query, headers = self._signed({"uuid": uuid, "currency": currency})
+            result = _send_get_request(url + '?' + query, headers=headers, account=self.access)
             if contain_req:
                 return result
             else:
                 return result[0]
         except Exception as x:
             print(x.__class__.__name__)
-            logger.info(result)
+            logger.info(x)
             return None
 
 
@@ -0,0 +1,148 @@
+# 원화 마켓 호가 단위 (가격 <-> 호가 번호 변환, 호가 이동, 수량 자르기)
+import numpy as np
+
+# 가격 구간 하한과 구간별 호가 단위
+BAND_FLOORS = np.array([0, 10, 100, 1000, 10000, 100000, 500000, 1000000, 2000000], dtype=np.float64)
+BAND_UNITS = np.array([0.01, 0.1, 1, 5, 10, 50, 100, 500, 1000], dtype=np.float64)
+
+# 구간 하한의 호가 번호 (0원부터 센 호가 수, 구간 하한은 모두 아래 구간 호가 단위의 배수)
+BAND_TICKS = np.concatenate([[0], np.cumsum(np.rint(np.diff(BAND_FLOORS) / BAND_UNITS[:-1]))]).astype(np.int64)
+
+# 수량 소수점 자리수
+VOLUME_DECIMALS = 8
+
+# 부동소수점 오차 허용치 (호가 단위 / 수량 최소 단위 대비)
+_EPSILON = 1e-6
+# 큰 값의 부동소수점 오차 허용치 (값 대비, double 정밀도 2.2e-16 의 몇 배)
+_RELATIVE_EPSILON = 1e-15
+
+
+def native(values):
+    """
+    배열/numpy 숫자를 파이썬 숫자로 변환 (정수 값은 int, 주문 가격 문자열이 "700.0" 이 되지 않도록)
+    :param values: 스칼라 또는 배열
+    :return: 숫자 또는 리스트
+    """
+    values = np.asarray(values)
+    if values.ndim > 0:
+        return [native(value) for value in values]
+    value = values.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _native(values, scalar):
+    return native(values) if scalar else values
+
+
+def _band(price):
+    # 0 이하 가격은 첫 구간으로 (-1 이 마지막 구간을 가리키지 않도록)
+    return np.maximum(np.searchsorted(BAND_FLOORS, price, side='right') - 1, 0)
+
+
+def tick_unit(price):
+    """
+    가격대별 호가 단위
+    :param price: 가격 (스칼라 또는 배열)
+    :return: 호가 단위
+    """
+    price = np.asarray(price, dtype=np.float64)
+    return _native(BAND_UNITS[_band(price)], price.ndim == 0)
+
+
+def price_to_tick(price, mode='nearest'):
+    """
+    가격을 호가 번호로 변환
+    :param price: 가격 (스칼라 또는 배열)
+    :param mode: nearest(가까운 호가), floor(내림, 매수), ceil(올림, 매도)
+    :return: 호가 번호 (int64)
+    """
+    price = np.asarray(price, dtype=np.float64)
+    band = _band(price)
+    offset = (price - BAND_FLOORS[band]) / BAND_UNITS[band]
+    if mode == 'floor':
+        offset = np.floor(offset + _EPSILON)
+    elif mode == 'ceil':
+        offset = np.ceil(offset - _EPSILON)
+    else:
+        offset = np.rint(offset)
+    ticks = BAND_TICKS[band] + offset.astype(np.int64)
+    return ticks.item() if price.ndim == 0 else ticks
+
+
+def tick_to_price(ticks):
+    """
+    호가 번호를 가격으로 변환
+    :param ticks: 호가 번호 (스칼라 또는 배열)
+    :return: 가격 (스칼라 입력이면 정수 가격은 int)
+    """
+    ticks = np.asarray(ticks, dtype=np.int64)
+    band = np.maximum(np.searchsorted(BAND_TICKS, ticks, side='right') - 1, 0)
+    price = np.round(BAND_FLOORS[band] + (ticks - BAND_TICKS[band]) * BAND_UNITS[band], 2)
+    return _native(price, ticks.ndim == 0)
+
+
+def round_to_tick(price, mode='nearest'):
+    """
+    호가 단위에 맞는 가격으로 변환
+    :param price: 가격 (스칼라 또는 배열)
+    :param mode: nearest, floor, ceil
+    :return: 가격
+    """
+    return tick_to_price(price_to_tick(price, mode))
+
+
+def step_ticks(price, n, mode='nearest'):
+    """
+    price 에서 n 호가 위(음수면 아래) 가격 (구간 경계를 넘으면 넘어간 구간의 호가 단위 적용)
+    :param price: 가격 (스칼라 또는 배열)
+    :param n: 이동할 호가 수 (스칼라 또는 배열)
+    :param mode: price 가 호가 단위에 맞지 않을 때 기준 호가를 고르는 방법
+    :return: 가격
+    """
+    return tick_to_price(np.maximum(np.add(price_to_tick(price, mode), n), 0))
+
+
+def ladder(price, count, step=1, mode='nearest'):
+    """
+    price 다음 호가부터 step 호가 간격으로 count 개 가격
+    :param price: 기준 가격
+    :param count: 가격 개수
+    :param step: 호가 간격 (음수면 아래 방향)
+    :param mode: price 가 호가 단위에 맞지 않을 때 기준 호가를 고르는 방법
+    :return: 가격 배열
+    """
+    return step_ticks(price, step * np.arange(1, count + 1), mode)
+
+
+def quantize_volume(volume, mode='floor'):
+    """
+    수량을 소수점 8자리로 자름
+    :param volume: 수량 (스칼라 또는 배열)
+    :param mode: floor(내림), nearest(반올림)
+    :return: 수량
+    """
+    volume = np.asarray(volume, dtype=np.float64)
+    factor = 10 ** VOLUME_DECIMALS
+    if mode == 'floor':
+        # 1e8 을 곱한 값의 오차는 값의 크기에 비례하므로 허용치도 크기에 비례하게 둠
+        # (이미 8자리인 수량은 그대로, 다시 적용해도 같은 값)
+        scaled = volume * factor
+        quantized = np.floor(scaled + np.maximum(_EPSILON, np.abs(scaled) * _RELATIVE_EPSILON)) / factor
+    else:
+        quantized = np.rint(volume * factor) / factor
+    return quantized.item() if volume.ndim == 0 else quantized
+
+
+if __name__ == "__main__":
+    # 수량 자르기 검사 (8자리 수량은 그대로, 두 번 적용해도 같은 값)
+    rng = np.random.default_rng(0)
+    volumes = np.floor(rng.uniform(0, 1e5, 200000) * 1e8) / 1e8
+    assert (quantize_volume(volumes) == volumes).all()
+    assert quantize_volume(83757.79756626) == 83757.79756626
+    raw = rng.uniform(0, 1e5, 200000)
+    once = quantize_volume(raw)
+    assert (quantize_volume(once) == once).all()
+    assert (np.abs(raw - once) < 1.000001e-8).all()
+    print("quantize_volume ok")
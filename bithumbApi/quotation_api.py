@@ -1,10 +1,17 @@
 # bithumb Quatation (시세 조회) API
 import datetime
+import json
+import math
+import os
+import numpy as np
 import pandas as pd
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from bithumbApi.request_api import _call_public_api
-from bithumbApi.errors import raise_error
-import requests
+from bithumbApi.errors import BithumbError
+from bithumbApi.candle_store import Candles, get_candle_store, add_coverage, find_coverage
 import re
 
 logger = None
@@ -28,6 +35,198 @@ def parse_remaining_req(data):
     return ret
 
 
+# 마켓 목록 스냅샷 파일
+MARKET_CACHE_FILE = 'market_cache.json'
+
+# 마켓 목록 필드 (isDetails=false 조회 결과)
+MARKET_FIELDS = ("market", "korean_name", "english_name")
+
+
+class MarketCache:
+    """/v1/market/all 마켓 목록 캐시
+
+        마지막으로 받은 목록을 파일(filename)에 저장해 두고 시작할 때 바로 읽으며,
+        ttl 이 지나면 백그라운드 스레드에서 다시 받아 교체한다.
+
+        사용 예제:
+
+            >> markets = get_market_cache()
+            >> markets.markets("KRW")                    # 원화 마켓 목록
+            >> markets.get("KRW-BTC")                    # 마켓 코드로 조회
+            >> markets.find_market("비트코인", "KRW")      # 한글명 -> 마켓 코드
+
+        주의 :
+
+           저장된 스냅샷이 없으면 처음 조회할 때 동기로 받는다.
+           조회에 실패하면 기존 목록을 그대로 사용한다.
+    """
+    def __init__(self, filename=MARKET_CACHE_FILE, ttl=600.0):
+        """마켓 캐시 생성자
+
+        Args:
+            filename (str  , optional): 스냅샷 파일 (None 이면 메모리에만 보관)
+            ttl      (float, optional): 목록을 다시 받기 전까지 사용할 시간(초)
+        """
+        self.filename = filename
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        self.__refresh_lock = threading.Lock()
+        self.__contents = None          # 상세 마켓 목록
+        self.__by_market = {}           # 마켓 코드 -> 마켓 정보
+        self.__by_korean_name = {}      # (fiat, 한글명) -> 마켓 코드
+        self.__limit = None             # 마지막 조회의 요청 제한 정보
+        self.__updated_at = None        # 마지막 조회 시각 time.time()
+        self.__refreshing = False
+        self._load()
+
+    def _set(self, contents, updated_at, limit=None):
+        by_market = {x['market']: x for x in contents}
+        by_korean_name = {(x['market'].split('-')[0], x['korean_name']): x['market'] for x in contents}
+        with self.__lock:
+            self.__contents = contents
+            self.__by_market = by_market
+            self.__by_korean_name = by_korean_name
+            self.__updated_at = updated_at
+            if limit is not None:
+                self.__limit = limit
+
+    def _load(self):
+        if self.filename is None:
+            return
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self._set(snapshot['markets'], snapshot['updated_at'])
+        except FileNotFoundError:
+            pass
+        except Exception as x:
+            print("market cache load failed", x.__class__.__name__)
+
+    def _save(self, contents, updated_at):
+        if self.filename is None:
+            return
+        tmp = self.filename + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'updated_at': updated_at, 'markets': contents}, f, ensure_ascii=False)
+            os.replace(tmp, self.filename)
+        except Exception as x:
+            print("market cache save failed", x.__class__.__name__)
+
+    def _fetch(self):
+        """마켓 목록을 받아서 교체 (실패하면 예외 발생)"""
+        with self.__refresh_lock:
+            try:
+                contents, limit = _call_public_api("https://api.bithumb.com/v1/market/all", isDetails="true")
+                updated_at = time.time()
+                self._set(contents, updated_at, limit)
+                self._save(contents, updated_at)
+            finally:
+                self.__refreshing = False
+
+    def refresh(self):
+        """마켓 목록을 다시 받아서 교체
+
+        Returns:
+            bool: 성공 여부 (실패하면 기존 목록 유지)
+        """
+        try:
+            self._fetch()
+            return True
+        except Exception as x:
+            print(x.__class__.__name__)
+            logger.info(x)
+            return False
+
+    def _ensure(self):
+        """목록이 없으면 바로 받고 (실패하면 예외 발생), 오래되었으면 백그라운드에서 갱신"""
+        if self.__contents is None:
+            self._fetch()
+            return
+        with self.__lock:
+            stale = self.__updated_at is None or time.time() - self.__updated_at >= self.ttl
+            start = stale and not self.__refreshing
+            if start:
+                self.__refreshing = True
+        if start:
+            threading.Thread(target=self.refresh, daemon=True).start()
+
+    def markets(self, fiat="ALL", isDetails=True):
+        """마켓 목록
+
+        Args:
+            fiat      (str , optional): "ALL", "KRW", "BTC", "USDT"
+            isDetails (bool, optional): False 이면 MARKET_FIELDS 만 리턴
+
+        Returns:
+            list: 마켓 정보 리스트
+        """
+        self._ensure()
+        contents = self.__contents
+        if fiat != "ALL":
+            contents = [x for x in contents if x['market'].startswith(fiat)]
+        if not isDetails:
+            contents = [{field: x.get(field) for field in MARKET_FIELDS} for x in contents]
+        return contents
+
+    def tickers(self, fiat="ALL"):
+        """마켓 코드 목록
+
+        Args:
+            fiat (str, optional): "ALL", "KRW", "BTC", "USDT"
+
+        Returns:
+            list: 마켓 코드 리스트
+        """
+        return [x['market'] for x in self.markets(fiat)]
+
+    def get(self, market):
+        """마켓 코드로 마켓 정보 조회
+
+        Args:
+            market (str): 마켓 코드 (ex. KRW-BTC)
+
+        Returns:
+            dict: 마켓 정보 (없으면 None)
+        """
+        self._ensure()
+        return self.__by_market.get(market)
+
+    def find_market(self, korean_name, fiat="KRW"):
+        """한글명으로 마켓 코드 조회
+
+        Args:
+            korean_name (str): 코인 한글명 (ex. 비트코인)
+            fiat        (str, optional): "KRW", "BTC", "USDT"
+
+        Returns:
+            str: 마켓 코드 (없으면 None)
+        """
+        self._ensure()
+        return self.__by_korean_name.get((fiat, korean_name))
+
+    def limit_info(self):
+        """마지막 조회의 요청 제한 정보"""
+        return self.__limit
+
+
+_market_cache = None
+_market_cache_lock = threading.Lock()
+
+
+def get_market_cache():
+    """
+    프로세스 전체에서 공유하는 마켓 목록 캐시
+    :return: MarketCache
+    """
+    global _market_cache
+    if _market_cache is None:
+        with _market_cache_lock:
+            if _market_cache is None:
+                _market_cache = MarketCache()
+    return _market_cache
+
+
 def fetch_market(isDetails=False, limit_info=False):
     """업비트에서 거래 가능한 마켓 목록
 
@@ -38,24 +237,12 @@ def fetch_market(isDetails=False, limit_info=False):
     Returns:
         list, (dict): 마켓 목록 리스트, 요청 제한 정보 딕셔너리
     """
-    url = "https://api.bithumb.com/v1/market/all"
-
-    if isDetails:
-        query_string = {"isDetails": "true"}
-    else:
-        query_string = {"isDetails": "false"}
-    resp = requests.get(url, params=query_string)
-
-    if resp.status_code == 200:
-        remaining_req = resp.headers.get('Remaining-Req')
-        limit = parse_remaining_req(remaining_req)
-        data = resp.json()
-        if limit_info:
-            return data, limit
-        else:
-            return data
+    cache = get_market_cache()
+    data = cache.markets(isDetails=isDetails)
+    if limit_info:
+        return data, cache.limit_info()
     else:
-        raise_error(resp.status_code)
+        return data
 
 
 def get_tickersEng(fiat="ALL", limit_info=False):
@@ -66,29 +253,13 @@ def get_tickersEng(fiat="ALL", limit_info=False):
     :return:
     """
     try:
-        url = "https://api.bithumb.com/v1/market/all"
-
-        # call REST API
-        ret = _call_public_api(url)
-        if isinstance(ret, tuple):
-            contents, req_limit_info = ret
-        else:
-            contents = None
-            req_limit_info = None
-
-        tickers = None
-        if isinstance(contents, list):
-            for x in contents:
-                markets = [x['market'] for x in contents]
-            if fiat != "ALL":
-                tickers = [x for x in markets if x.startswith(fiat)]
-            else:
-                tickers = markets
+        cache = get_market_cache()
+        tickers = cache.tickers(fiat)
 
         if limit_info is False:
             return tickers
         else:
-            return tickers, req_limit_info
+            return tickers, cache.limit_info()
 
     except Exception as x:
         print(x.__class__.__name__)
@@ -104,29 +275,13 @@ def get_tickersObj(fiat="ALL", limit_info=False):
     :return:
     """
     try:
-        url = "https://api.bithumb.com/v1/market/all"
-
-        # call REST API
-        ret = _call_public_api(url)
-        if isinstance(ret, tuple):
-            contents, req_limit_info = ret
-        else:
-            contents = None
-            req_limit_info = None
-
-        markets = {}
-        if isinstance(contents, list):
-            for x in contents:
-                if fiat != "ALL":
-                    markets = [x for x in contents if x["market"].startswith(fiat)]
-                else:
-                    markets = contents
-                    print("tickers = markets")
+        cache = get_market_cache()
+        markets = cache.markets(fiat, isDetails=False)
 
         if limit_info is False:
             return markets
         else:
-            return markets, req_limit_info
+            return markets, cache.limit_info()
 
     except Exception as x:
         print(x.__class__.__name__)
@@ -168,52 +323,228 @@ def get_url_ohlcv(interval):
     return url
 
 
-def get_ohlcv(ticker="KRW-BTC", interval="day", count=200, to=None, period=0.1):
+OHLCV_COLUMNS = {"opening_price": "open", "high_price": "high", "low_price": "low", "trade_price": "close",
+                 "candle_acc_trade_volume": "volume", "candle_acc_trade_price": "value"}
+
+
+def _candles_to_frame(contents):
     """
-    캔들 조회
+    캔들 조회 응답 1페이지를 시간순 DataFrame 으로 변환
+    :param contents: 캔들 조회 응답 리스트
+    :return: DataFrame (컬럼명은 API 필드명)
+    """
+    return Candles.from_contents(contents).frame()
+
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+# 이 시각 이전에는 캔들이 없음 (조회 결과가 페이지보다 적게 오면 coverage 시작으로 사용, epoch 초)
+HISTORY_START = 0
+
+# 캔들 1개의 길이(초) (진행 중인 캔들을 coverage 에서 빼는 기준, 주/월봉은 넉넉하게)
+CANDLE_LENGTHS = {"days": 86400, "weeks": 7 * 86400, "months": 31 * 86400}
+
+
+def _candle_key(url):
+    """
+    캔들 url 을 저장소 키로 변환 (ex. .../candles/minutes/1 -> minutes1)
+    :param url: get_url_ohlcv 가 리턴한 url
     :return:
     """
+    return url.rsplit("/candles/", 1)[1].replace("/", "")
+
+
+def _candle_length(key):
+    if key.startswith("minutes"):
+        return int(key[len("minutes"):]) * 60
+    return CANDLE_LENGTHS[key]
+
+
+def _to_kst(to):
+    """
+    조회 기준 시각을 KST 시각의 epoch 초로 변환 (tz 가 없는 값은 KST 로 간주)
+    :param to: None, 문자열, datetime, Timestamp
+    :return: int
+    """
+    if to is None:
+        to = pd.Timestamp(datetime.datetime.now(KST).replace(tzinfo=None))
+    to = pd.Timestamp(to)
+    if to.tzinfo is not None:
+        to = to.tz_convert(KST).tz_localize(None)
+    return int(to.value // 10 ** 9)
+
+
+def _to_param(to):
+    """
+    KST 시각의 epoch 초를 캔들 조회 to 파라미터 (UTC "YYYY-MM-DD HH:MM:SS") 로 변환
+    :param to: KST 시각 epoch 초
+    :return: 문자열
+    """
+    return str(np.datetime64(to - 9 * 3600, 's')).replace("T", " ")
+
+
+def _fetch_candle_page(url, ticker, to, count=200):
+    """
+    to 이전 캔들 1페이지 조회
+    :param url: 캔들 url
+    :param ticker: 마켓 코드
+    :param to: KST 시각 epoch 초 (미포함)
+    :param count: 캔들 개수
+    :return: 캔들 조회 응답 리스트 (최신순)
+    """
+    return _call_public_api(url, market=ticker, count=count, to=_to_param(to))[0]
+
+
+def _get_candles(ticker, interval, count, to=None, period=0.1, store=True, max_workers=8):
+    """
+    캔들 조회 (get_ohlcv 참고)
+    :return: 시간순 Candles
+    """
     MAX_CALL_COUNT = 200
+    url = get_url_ohlcv(interval=interval)
+    key = _candle_key(url)
+    end = _to_kst(to)
+    count = max(count, 1)
+    length = _candle_length(key)
+    # 거래가 없던 캔들은 빠지므로 200개 페이지는 항상 200 * length 이상을 덮는다
+    concurrent = max_workers > 1 and (key.startswith("minutes") or key == "days")
+
+    candle_store = get_candle_store()
+    with candle_store.lock(ticker, key):
+        if store:
+            candles, coverage = candle_store.load(ticker, key)
+        else:
+            candles, coverage = Candles(), []
+
+        # 진행 중인 캔들은 저장만 하고 coverage 에는 넣지 않음 (다음 조회 때 다시 받음)
+        closed = _to_kst(None) - length
+        changed = False
+        cursor = end
+        try:
+            while cursor > HISTORY_START:
+                have = len(candles.between(cursor, end))
+                if have >= count:
+                    break
+
+                segment = find_coverage(coverage, cursor)
+                if segment is not None:
+                    cursor = segment[0]
+                    continue
+
+                if concurrent:
+                    # 남은 개수와 바로 이전 저장 구간까지의 거리 중 작은 쪽만큼 페이지를 나눔
+                    # (상장 이전 구간을 한꺼번에 요청하지 않도록 한 번에 max_workers * 4 페이지까지)
+                    pages = min(math.ceil((count - have) / MAX_CALL_COUNT), max_workers * 4)
+                    previous = [stop for _, stop in coverage if stop < cursor]
+                    if previous:
+                        pages = min(pages, math.ceil((cursor - previous[-1]) / (length * MAX_CALL_COUNT)))
+                    bounds = [cursor - length * MAX_CALL_COUNT * i for i in range(max(pages, 1))]
+                    with ThreadPoolExecutor(max_workers=min(max_workers, len(bounds))) as executor:
+                        results = list(executor.map(partial(_fetch_candle_page, url, ticker), bounds))
+                else:
+                    if changed:
+                        time.sleep(period)
+                    bounds = [cursor]
+                    results = [_fetch_candle_page(url, ticker, cursor)]
+                changed = True
+
+                # 이번에 받은 페이지가 모두 들어갈 만큼 한 번에 늘려 두고 바로 디코딩
+                candles.reserve(len(candles) + sum(len(contents) for contents in results))
+                for bound, contents in zip(bounds, results):
+                    oldest = candles.extend(contents)
+                    if len(contents) < MAX_CALL_COUNT:
+                        # 더 이전 캔들이 없음 (이후 페이지는 비어 있음)
+                        coverage = add_coverage(coverage, HISTORY_START, min(bound, closed))
+                        cursor = HISTORY_START
+                        break
+                    if min(bound, closed) > oldest:
+                        coverage = add_coverage(coverage, oldest, min(bound, closed))
+                    cursor = oldest
+                candles.normalize()
+        finally:
+            if store and changed:
+                candle_store.save(ticker, key, candles, coverage)
+
+    # 저장소가 메모리에 두고 계속 쓰는 배열이므로 리턴할 구간만 복사
+    return candles.between(cursor, end).tail(count).copy()
+
+
+def get_ohlcv(ticker="KRW-BTC", interval="day", count=200, to=None, period=0.1, store=True, max_workers=8):
+    """
+    캔들 조회
+    로컬 저장소(candle_store)에 이미 조회한 구간은 파일에서 읽고, 비어 있는 최신 구간/중간 구간만 API 로 조회한다
+    분봉/일봉은 페이지 경계(to)를 미리 계산해서 여러 페이지를 동시에 조회한다 (요청 수 제한은 request_api 가 담당)
+    조회한 페이지는 컬럼 배열(Candles)에 바로 디코딩하고 마지막에 DataFrame 으로 한 번만 감싼다
+    :param ticker: 마켓 코드
+    :param interval: 캔들 주기 (get_url_ohlcv 참고)
+    :param count: 캔들 개수
+    :param to: 마지막 캔들 시각 (미포함, tz 가 없으면 KST)
+    :param period: 페이지를 순서대로 조회할 때(주봉/월봉, max_workers=1) 조회 간격(초)
+    :param store: False 이면 저장소를 사용하지 않고 모두 API 로 조회
+    :param max_workers: 동시에 조회할 최대 페이지 수
+    :return: DataFrame
+    """
     try:
-        url = get_url_ohlcv(interval=interval)
-
-        if to == None:
-            to = datetime.datetime.now()
-        elif isinstance(to, str):
-            to = pd.to_datetime(to).to_pydatetime()
-        elif isinstance(to, pd._libs.tslibs.timestamps.Timestamp):
-            to = to.to_pydatetime()
-
-        dfs = []
-        count = max(count, 1)
-        for pos in range(count, 0, -200):
-            query_count = min(MAX_CALL_COUNT, pos)
-
-            if to.tzinfo is None:
-                to = to.astimezone()
-            to = to.astimezone(datetime.timezone.utc)
-            to = to.strftime("%Y-%m-%d %H:%M:%S")
-
-            contents = _call_public_api(url, market=ticker, count=query_count, to=to)[0]
-            dt_list = [datetime.datetime.strptime(x['candle_date_time_kst'], "%Y-%m-%dT%H:%M:%S") for x in contents]
-            df = pd.DataFrame(contents, columns=['opening_price', 'high_price', 'low_price', 'trade_price',
-                                                 'candle_acc_trade_volume', 'candle_acc_trade_price'],
-                              index=dt_list)
-            df = df.sort_index()
-            if df.shape[0] == 0:
-                break
-            dfs += [df]
-
-            to = df.index[0].to_pydatetime()
-
-            if pos > 200:
-                time.sleep(period)
-
-        df = pd.concat(dfs).sort_index()
-        df = df.rename(
-            columns={"opening_price": "open", "high_price": "high", "low_price": "low", "trade_price": "close",
-                     "candle_acc_trade_volume": "volume", "candle_acc_trade_price": "value"})
-        return df
+        candles = _get_candles(ticker, interval, count, to=to, period=period, store=store, max_workers=max_workers)
+        return candles.frame(OHLCV_COLUMNS.values())
+    except Exception as x:
+        print(x.__class__.__name__)
+        logger.info(x.__class__.__name__)
+        return None
+
+
+def _derived_minutes(interval):
+    """
+    만들 캔들 주기(분)
+    :param interval: minute3 ~ minute240, day (get_url_ohlcv 와 같은 이름)
+    :return: int
+    """
+    if interval in ["day", "days"]:
+        return 1440
+    m = re.fullmatch("minutes?([0-9]+)", interval)
+    if m is None:
+        raise ValueError("unsupported interval: {}".format(interval))
+    return int(m.group(1))
+
+
+def get_ohlcv_multi(ticker="KRW-BTC", intervals=("minute3", "minute5", "minute10", "minute15", "minute30",
+                                                 "minute60", "minute240"),
+                    count=200, to=None, offset=0, source="minute1", max_source=20000):
+    """
+    source 캔들을 한 번만 받아서 (로컬 저장소 사용) 여러 주기 캔들을 만든다
+    주기마다 (count + 1) * 주기 / source 주기 개의 source 캔들이 필요하다
+    (ex. minute1 로 minute60 200개는 12,060개(약 60 페이지), day 200개는 289,440개(약 1,450 페이지))
+    필요한 source 캔들이 max_source 를 넘는 주기는 offset 이 0 이면 그 주기의 캔들 API 로 따로 조회한다
+    :param ticker: 마켓 코드
+    :param intervals: 만들 캔들 주기 리스트
+    :param count: 주기별 캔들 개수
+    :param to: 마지막 캔들 시각 (미포함, tz 가 없으면 KST)
+    :param offset: 캔들 시작 시각 오프셋(분) (ex. 일봉을 09:00 에 시작하려면 540)
+    :param source: 원본 캔들 주기 (intervals 와 offset 이 이 주기의 배수여야 함)
+    :param max_source: source 에서 만들 주기의 최대 source 캔들 수 (offset 이 0 이 아니면 적용하지 않음)
+    :return: {주기: DataFrame}
+    """
+    try:
+        base = _derived_minutes(source)
+        # 주기별 count 개 + 앞쪽에 잘리는 캔들 1개 분량
+        need = {interval: (count + 1) * _derived_minutes(interval) // base for interval in intervals}
+        own = [interval for interval in intervals if offset == 0 and need[interval] > max_source]
+        derive = [interval for interval in intervals if interval not in own]
+        # source 는 source 에서 만들 주기 중 가장 많이 필요한 만큼만 조회
+        candles = Candles()
+        if derive:
+            candles = _get_candles(ticker, source, max(need[interval] for interval in derive), to=to)
+
+        ret = {}
+        for interval in intervals:
+            if interval in own:
+                ret[interval] = _get_candles(ticker, interval, count, to=to).frame(OHLCV_COLUMNS.values())
+                continue
+            derived = candles.resample(_derived_minutes(interval), offset)
+            # 원본 시작 전부터 이어지는 첫 캔들은 일부만 모인 것이므로 제외
+            derived = derived.between(candles.time[0] if len(candles) else None)
+            ret[interval] = derived.tail(count).frame(OHLCV_COLUMNS.values())
+        return ret
     except Exception as x:
         print(x.__class__.__name__)
         logger.info(x.__class__.__name__)
@@ -224,14 +555,13 @@ def get_daily_ohlcv_from_base(ticker="KRW-BTC", base=0):
     """
 
     :param ticker:
-    :param base:
+    :param base: 일봉 시작 시각 (시)
     :return:
     """
     try:
-        df = get_ohlcv(ticker, interval="minute60")
-        df = df.resample('24H', base=base).agg(
-            {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
-        return df
+        candles = _get_candles(ticker, "minute60", 200)
+        df = candles.resample(1440, base * 60).frame(OHLCV_COLUMNS.values())
+        return df[['open', 'high', 'low', 'close', 'volume']]
     except Exception as x:
         print(x.__class__.__name__)
         logger.info(x.__class__.__name__)
@@ -265,6 +595,205 @@ def get_current_price(ticker="KRW-BTC"):
         logger.info(x.__class__.__name__)
 
 
+class PriceService:
+    """여러 마켓의 현재가를 한 번의 /v1/ticker 요청으로 모아서 조회하는 캐시
+
+        사용 예제:
+
+            >> prices = get_price_service()
+            >> prices.watch(["KRW-BTC", "KRW-XRP"])
+            >> prices.get("KRW-BTC")         # 캐시가 ttl 보다 오래되었으면 watch 한 마켓 전체를 함께 갱신
+            >> prices.staleness("KRW-BTC")   # 마지막 갱신 후 지난 시간(초)
+
+        주의 :
+
+           watch 한 마켓은 chunk_size 개씩 나눠서 요청한다.
+           get 으로 처음 조회한 마켓은 조회에 성공하면 자동으로 watch 목록에 추가된다.
+           갱신에 실패해서 max_stale 보다 오래된 현재가는 리턴하지 않는다. (get 은 None, get_many 는 제외)
+           거래소가 거절한 마켓(4xx)은 따로 골라내서 watch 목록에서 빼고 이후에는 조회하지 않는다.
+    """
+    def __init__(self, ttl=1.0, chunk_size=100, max_stale=5.0):
+        """가격 서비스 생성자
+
+        Args:
+            ttl        (float, optional): 현재가를 재사용할 시간(초)
+            chunk_size (int  , optional): 요청 1번에 담을 최대 마켓 수
+            max_stale  (float, optional): 갱신에 실패했을 때 마지막 현재가를 대신 리턴할 최대 시간(초)
+        """
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+        self.max_stale = max(max_stale, ttl)
+        self.__lock = threading.Lock()
+        self.__refresh_lock = threading.Lock()
+        self.__markets = []
+        self.__invalid = set()  # 거래소가 거절한 마켓
+        self.__prices = {}      # 마켓 -> (현재가, 갱신 시각 time.time(), 갱신 시각 time.monotonic())
+
+    def _valid(self, ticker):
+        return isinstance(ticker, str) and '-' in ticker and ticker not in self.__invalid
+
+    def watch(self, tickers):
+        """함께 갱신할 마켓 추가
+
+        Args:
+            tickers (str, list): 마켓 코드 또는 마켓 코드 리스트
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        with self.__lock:
+            for ticker in tickers:
+                if self._valid(ticker) and ticker not in self.__markets:
+                    self.__markets.append(ticker)
+
+    def unwatch(self, tickers):
+        """갱신 대상에서 마켓 제외
+
+        Args:
+            tickers (str, list): 마켓 코드 또는 마켓 코드 리스트
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        with self.__lock:
+            self.__markets = [ticker for ticker in self.__markets if ticker not in tickers]
+
+    def _fresh(self, ticker, now):
+        entry = self.__prices.get(ticker)
+        return entry is not None and now - entry[2] < self.ttl
+
+    def _usable(self, ticker, now):
+        """갱신에 실패했어도 리턴할 수 있는 현재가인지 (max_stale 이내)"""
+        entry = self.__prices.get(ticker)
+        return entry is not None and now - entry[2] < self.max_stale
+
+    def _fetch_chunk(self, url, chunk, updated):
+        """마켓 묶음의 현재가 조회 (거래소가 묶음을 거절하면 반으로 나눠서 거절된 마켓만 골라냄)
+
+        Args:
+            url     (str): 현재가 조회 url
+            chunk   (list): 마켓 코드 리스트
+            updated (dict): 조회한 {마켓: 현재가} 를 추가할 딕셔너리
+
+        Returns:
+            list: 거래소가 거절한 마켓
+        """
+        try:
+            result = _call_public_api(url, markets=",".join(chunk))
+        except BithumbError as x:
+            # 요청 수 제한/서버 오류는 마켓 문제가 아니므로 나누지 않음
+            if x.retryable or x.status_code is None or x.status_code >= 500:
+                logger.info(x)
+                return []
+            if len(chunk) == 1:
+                logger.info("현재가 조회 거절 마켓 제외: " + chunk[0])
+                return chunk
+            half = len(chunk) // 2
+            return self._fetch_chunk(url, chunk[:half], updated) + self._fetch_chunk(url, chunk[half:], updated)
+        except Exception as x:
+            logger.info(x)
+            return []
+        if result is not None:
+            for content in result[0]:
+                updated[content['market']] = content['trade_price']
+        return []
+
+    def refresh(self, tickers=None):
+        """watch 한 마켓(+ tickers)의 현재가를 chunk_size 개씩 묶어서 갱신
+
+        Args:
+            tickers (list, optional): watch 목록에 없어도 함께 조회할 마켓
+
+        Returns:
+            dict: 이번에 갱신된 {마켓: 현재가}
+        """
+        with self.__refresh_lock:
+            with self.__lock:
+                # 기다리는 동안 다른 스레드가 갱신했으면 다시 요청하지 않음
+                if tickers and all(self._fresh(ticker, time.monotonic()) for ticker in tickers):
+                    return {}
+                markets = list(self.__markets)
+                for ticker in tickers or []:
+                    if self._valid(ticker) and ticker not in markets:
+                        markets.append(ticker)
+
+            url = "https://api.bithumb.com/v1/ticker"
+            updated = {}
+            invalid = []
+            for start in range(0, len(markets), self.chunk_size):
+                invalid += self._fetch_chunk(url, markets[start:start + self.chunk_size], updated)
+
+            now, monotonic = time.time(), time.monotonic()
+            with self.__lock:
+                if invalid:
+                    self.__invalid.update(invalid)
+                    self.__markets = [market for market in self.__markets if market not in self.__invalid]
+                for market, price in updated.items():
+                    self.__prices[market] = (price, now, monotonic)
+                    if market not in self.__markets:
+                        self.__markets.append(market)
+            return updated
+
+    def get(self, ticker):
+        """현재가 조회 (캐시가 오래되었으면 갱신)
+
+        Args:
+            ticker (str): 마켓 코드
+
+        Returns:
+            float: 현재가 (조회 실패 후 max_stale 보다 오래되었으면 None)
+        """
+        with self.__lock:
+            entry = self.__prices.get(ticker)
+            if entry is not None and self._fresh(ticker, time.monotonic()):
+                return entry[0]
+        self.refresh([ticker])
+        with self.__lock:
+            if not self._usable(ticker, time.monotonic()):
+                return None
+            return self.__prices[ticker][0]
+
+    def get_many(self, tickers):
+        """여러 마켓 현재가 조회 (오래된 마켓이 있으면 한 번에 갱신)
+
+        Args:
+            tickers (list): 마켓 코드 리스트
+
+        Returns:
+            dict: {마켓: 현재가} (조회 실패 후 max_stale 보다 오래된 마켓은 제외)
+        """
+        with self.__lock:
+            now = time.monotonic()
+            stale = [ticker for ticker in tickers if not self._fresh(ticker, now)]
+        if stale:
+            self.refresh(stale)
+        with self.__lock:
+            now = time.monotonic()
+            return {ticker: self.__prices[ticker][0] for ticker in tickers if self._usable(ticker, now)}
+
+    def staleness(self, ticker):
+        """마지막 갱신 후 지난 시간
+
+        Args:
+            ticker (str): 마켓 코드
+
+        Returns:
+            float: 초 (조회한 적 없으면 None)
+        """
+        with self.__lock:
+            entry = self.__prices.get(ticker)
+        return time.time() - entry[1] if entry is not None else None
+
+
+_price_service = PriceService()
+
+
+def get_price_service():
+    """
+    프로세스 전체에서 공유하는 가격 서비스
+    :return: PriceService
+    """
+    return _price_service
+
+
 def get_orderbook(tickers="KRW-BTC"):
     '''
     호가 정보 조회
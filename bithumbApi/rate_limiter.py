@@ -0,0 +1,312 @@
+# Remaining-Req 헤더 기반 요청 수 제한기
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from urllib.parse import urlparse
+
+# 그룹별 초당 요청 수 (빗썸 API 문서 기준 Public 150회/초, Private 140회/초)
+# 실제 값은 응답의 Remaining-Req 헤더로 계속 보정된다
+DEFAULT_LIMITS = {
+    'market': 150,
+    'ticker': 150,
+    'orderbook': 150,
+    'trades': 150,
+    'candles': 150,
+    'default': 140,
+    'order': 140,
+}
+
+# 요청 우선순위 (작을수록 먼저 처리): 주문 취소 > 주문 생성 > 계좌/주문 조회 > 시세 조회
+PRIORITY_CANCEL = 0
+PRIORITY_ORDER = 1
+PRIORITY_ACCOUNT = 2
+PRIORITY_MARKET = 3
+
+# 응답을 받기 전까지 사용할 경로별 그룹 추정값
+_PUBLIC_GROUPS = {
+    '/v1/market': 'market',
+    '/v1/ticker': 'ticker',
+    '/v1/orderbook': 'orderbook',
+    '/v1/trades': 'trades',
+    '/v1/candles': 'candles',
+}
+
+
+class TokenBucket:
+    """초당 rate 개씩 채워지고 최대 capacity 개까지 쌓이는 토큰 버킷
+
+        calibrate 는 최근 horizon ~ 2 * horizon 초 동안 서버가 알려준 (남은 요청 수 + 1) 의 최대값을
+        구간(period) 한도로 사용한다. 구간이 시작될 때의 응답이 한도를 가장 잘 보여주므로 최대값을 쓰고,
+        오래된 값은 버려서 서버 한도가 초기값보다 낮으면 capacity / rate 도 내려간다.
+    """
+    def __init__(self, rate, capacity=None, period=1.0, horizon=10.0):
+        """
+        :param rate: 초당 채워지는 토큰 수
+        :param capacity: 최대 토큰 수 (None 이면 rate)
+        :param period: 서버가 요청 수를 세는 구간(초) (초 단위 1, 분 단위 60)
+        :param horizon: 한도 추정에 사용할 관측 기간(초)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.period = period
+        self.horizon = horizon
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.__peak = None              # 이번 관측 기간의 최대 추정값
+        self.__previous_peak = None     # 직전 관측 기간의 최대 추정값
+        self.__peak_started = self.updated
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def reserve(self, now):
+        """
+        토큰 1개 사용을 시도
+        :param now: time.monotonic()
+        :return: 0 이면 사용 완료, 아니면 토큰이 생길 때까지 기다려야 하는 시간(초)
+        """
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def calibrate(self, remaining, now):
+        """
+        서버가 알려준 남은 요청 수로 버킷 보정
+        :param remaining: 현재 구간에서 남은 요청 수
+        :param now: time.monotonic()
+        """
+        self._refill(now)
+        # 남은 요청 수 + 방금 사용한 1회가 구간 한도의 추정값
+        estimate = float(remaining + 1)
+        if now - self.__peak_started >= self.horizon:
+            self.__previous_peak, self.__peak = self.__peak, None
+            self.__peak_started = now
+        if self.__peak is None or estimate > self.__peak:
+            self.__peak = estimate
+        self.capacity = max(self.__peak, self.__previous_peak or 0.0)
+        self.rate = self.capacity / self.period
+        self.tokens = min(self.tokens, float(remaining))
+
+    def refund(self):
+        """사용한 토큰 1개를 되돌림"""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def drain(self, now):
+        """토큰을 모두 비워 1초 동안 요청을 막음 (429 응답 등)"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 1.0 - self.capacity)
+
+
+class RateLimiter:
+    """Remaining-Req 그룹별 토큰 버킷을 관리하는 프로세스 공용 요청 수 제한기 / 스케줄러
+
+        사용 예제:
+
+            >> limiter = get_rate_limiter()
+            >> group = limiter.group_for('GET', url)
+            >> limiter.acquire(group, limiter.priority_for('GET', url), 'KRW-BTC')
+            >> resp = session.get(url)
+            >> limiter.update(group, 'market', 599, 9)
+
+        주의 :
+
+           버킷이 비었을 때만 호출한 스레드를 대기시킨다.
+           대기 중인 요청은 우선순위 순으로, 같은 우선순위 안에서는 키(코인)별로 번갈아 토큰을 받는다.
+    """
+    def __init__(self, limits=None):
+        self.__lock = threading.Condition()
+        self.__limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.__sec_buckets = {}
+        self.__min_buckets = {}
+        self.__learned_groups = {}     # (method, path) -> 실제 그룹명
+        self.__waiters = {}            # 그룹 -> [(priority, tag, seq)] 힙
+        self.__finish_tags = {}        # (그룹, priority, 키) -> 다음 요청의 공정 큐잉 태그
+        self.__virtual_time = {}       # (그룹, priority) -> 마지막으로 처리한 태그
+        self.__seq = itertools.count()
+
+    def _sec_bucket(self, group):
+        bucket = self.__sec_buckets.get(group)
+        if bucket is None:
+            rate = self.__limits.get(group, self.__limits.get('default', 10))
+            bucket = self.__sec_buckets[group] = TokenBucket(rate)
+        return bucket
+
+    def group_for(self, method, url):
+        """
+        요청이 속할 Remaining-Req 그룹
+        :param method: GET, POST, DELETE
+        :param url:
+        :return: 그룹명
+        """
+        path = urlparse(url).path
+        group = self.__learned_groups.get((method, path))
+        if group is not None:
+            return group
+
+        for prefix, public_group in _PUBLIC_GROUPS.items():
+            if path.startswith(prefix):
+                return public_group
+        if (method == 'POST' and path == '/v1/orders') or (method == 'DELETE' and path == '/v1/order'):
+            return 'order'
+        return 'default'
+
+    def priority_for(self, method, url):
+        """
+        요청의 기본 우선순위
+        :param method: GET, POST, DELETE
+        :param url:
+        :return: PRIORITY_CANCEL / PRIORITY_ORDER / PRIORITY_ACCOUNT / PRIORITY_MARKET
+        """
+        path = urlparse(url).path
+        if method == 'DELETE':
+            return PRIORITY_CANCEL
+        if method == 'POST' and path.startswith('/v1/orders'):
+            return PRIORITY_ORDER
+        for prefix in _PUBLIC_GROUPS:
+            if path.startswith(prefix):
+                return PRIORITY_MARKET
+        return PRIORITY_ACCOUNT
+
+    def _reserve(self, group):
+        """
+        그룹의 토큰 1개 사용을 시도 (lock 을 잡은 상태에서 호출)
+        :param group: 그룹명
+        :return: 0 이면 사용 완료, 아니면 다시 시도하기까지 기다릴 시간(초)
+        """
+        now = time.monotonic()
+        wait = self._sec_bucket(group).reserve(now)
+        min_bucket = self.__min_buckets.get(group)
+        if wait == 0 and min_bucket is not None:
+            wait = min_bucket.reserve(now)
+            if wait > 0:
+                # 분 단위 한도가 모자라면 초 단위 토큰은 돌려준다
+                self.__sec_buckets[group].refund()
+        return wait
+
+    def _enqueue(self, group, priority, key):
+        """
+        대기열에 등록 (start-time fair queuing 태그로 같은 우선순위 안의 키별 공정성 보장)
+        :return: 대기표 (priority, tag, seq)
+        """
+        vtime = self.__virtual_time.get((group, priority), 0)
+        tag = max(self.__finish_tags.get((group, priority, key), 0), vtime)
+        self.__finish_tags[(group, priority, key)] = tag + 1
+        ticket = (priority, tag, next(self.__seq))
+        heapq.heappush(self.__waiters.setdefault(group, []), ticket)
+        return ticket
+
+    def _try_acquire(self, group, ticket):
+        """
+        대기표 차례가 되었고 토큰이 있으면 사용 (lock 을 잡은 상태에서 호출)
+        :return: 0 이면 사용 완료, 양수면 토큰 대기 시간(초), None 이면 앞 순서 대기
+        """
+        waiters = self.__waiters[group]
+        if waiters[0] != ticket:
+            return None
+        wait = self._reserve(group)
+        if wait == 0:
+            heapq.heappop(waiters)
+            self.__virtual_time[(group, ticket[0])] = ticket[1]
+            self.__lock.notify_all()
+        return wait
+
+    def acquire(self, group, priority=PRIORITY_ACCOUNT, key=None):
+        """
+        그룹의 요청 가능 수가 남아 있을 때까지 대기 후 1회 사용
+        :param group: 그룹명
+        :param priority: 요청 우선순위
+        :param key: 공정하게 나눌 단위 (코인 마켓 코드 등)
+        """
+        with self.__lock:
+            # 대기열이 비어 있고 토큰이 있으면 바로 통과
+            if not self.__waiters.get(group) and self._reserve(group) == 0:
+                return
+            ticket = self._enqueue(group, priority, key)
+            while True:
+                wait = self._try_acquire(group, ticket)
+                if wait == 0:
+                    return
+                self.__lock.wait(wait)
+
+    async def acquire_async(self, group, priority=PRIORITY_ACCOUNT, key=None):
+        """
+        acquire 의 asyncio 버전 (이벤트 루프를 막지 않고 대기)
+        :param group: 그룹명
+        :param priority: 요청 우선순위
+        :param key: 공정하게 나눌 단위 (코인 마켓 코드 등)
+        """
+        with self.__lock:
+            if not self.__waiters.get(group) and self._reserve(group) == 0:
+                return
+            ticket = self._enqueue(group, priority, key)
+        try:
+            while True:
+                with self.__lock:
+                    wait = self._try_acquire(group, ticket)
+                if wait == 0:
+                    return
+                await asyncio.sleep(wait if wait is not None else 0.005)
+        except asyncio.CancelledError:
+            with self.__lock:
+                self.__waiters[group].remove(ticket)
+                heapq.heapify(self.__waiters[group])
+                self.__lock.notify_all()
+            raise
+
+    def update(self, group, actual_group, min, sec, method=None, url=None):
+        """
+        응답의 Remaining-Req 값으로 버킷 보정
+        추정한 그룹이 틀렸으면 추정한 그룹에서 사용한 토큰 1개를 돌려주고 (실제 그룹으로 옮기지 않음),
+        실제 그룹의 버킷은 남은 요청 수로 보정한다
+        :param group: 요청 전에 추정한 그룹명
+        :param actual_group: 응답 헤더의 그룹명
+        :param min: 분 단위 남은 요청 수
+        :param sec: 초 단위 남은 요청 수
+        :param method: 요청 메소드 (그룹명 학습용)
+        :param url: 요청 주소 (그룹명 학습용)
+        """
+        if actual_group is None:
+            return
+        with self.__lock:
+            now = time.monotonic()
+            if method is not None and url is not None:
+                self.__learned_groups[(method, urlparse(url).path)] = actual_group
+            if actual_group != group:
+                # 추정이 틀렸으면 추정한 그룹에서 사용한 토큰만 돌려준다
+                # (실제 그룹의 토큰은 아래 calibrate 가 서버의 남은 요청 수로 맞춘다)
+                self._sec_bucket(group).refund()
+            if sec is not None:
+                self._sec_bucket(actual_group).calibrate(sec, now)
+            if min is not None:
+                min_bucket = self.__min_buckets.get(actual_group)
+                if min_bucket is None:
+                    min_bucket = self.__min_buckets[actual_group] = TokenBucket((min + 1) / 60.0, min + 1,
+                                                                                period=60.0, horizon=120.0)
+                min_bucket.calibrate(min, now)
+            self.__lock.notify_all()
+
+    def penalize(self, group):
+        """
+        요청 수 초과(429) 응답 시 그룹의 남은 토큰을 비움
+        :param group: 그룹명
+        """
+        with self.__lock:
+            self._sec_bucket(group).drain(time.monotonic())
+
+
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter():
+    """
+    프로세스 전체에서 공유하는 요청 수 제한기
+    :return: RateLimiter
+    """
+    return _rate_limiter
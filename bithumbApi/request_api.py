@@ -1,9 +1,229 @@
+import copy
+import sys
 import re
+import queue
+import threading
 import requests
 import time
+from contextlib import contextmanager
+from urllib.parse import urlencode, urlparse
+from requests.adapters import HTTPAdapter
+
+from bithumbApi.errors import BithumbError, decode_error
+from bithumbApi.rate_limiter import get_rate_limiter
+from bithumbApi.retry import get_retry_engine
 
 getframe_expr = 'sys._getframe({}).f_code.co_name'
 
+API_URL = "https://api.bithumb.com"
+
+# 요청 대기 시간(초) (연결, 응답) - 멈춘 소켓이 풀의 세션을 계속 잡고 있지 않도록
+DEFAULT_TIMEOUT = (3.05, 10.0)
+
+
+class SessionPool:
+    """keep-alive 커넥션을 재사용하는 requests.Session 풀
+
+        사용 예제:
+
+            >> pool = SessionPool(pool_size=8)
+            >> pool.warm_up()
+            >> with pool.session() as session:
+                resp = session.get("https://api.bithumb.com/v1/ticker", params={"markets": "KRW-BTC"})
+
+        주의 :
+
+           requests.Session 은 thread-safe 하지 않으므로 한 번에 한 스레드만 세션을 사용한다.
+           풀이 비어 있으면 다른 스레드가 세션을 반납할 때까지 대기한다.
+           _send_request 는 timeout 을 지정하지 않은 요청에 풀의 timeout 을 사용한다.
+    """
+    def __init__(self, pool_size=8, pool_maxsize=4, idle_timeout=30.0, timeout=DEFAULT_TIMEOUT):
+        """세션 풀 생성자
+
+        Args:
+            pool_size    (int  , optional): 동시에 사용할 수 있는 세션 수
+            pool_maxsize (int  , optional): 세션별 호스트당 유지할 커넥션 수
+            idle_timeout (float, optional): 이 시간(초) 이상 쉬었던 세션은 사용 전에 커넥션을 새로 맺는다
+            timeout      (tuple, optional): 요청 대기 시간(초) (연결, 응답)
+        """
+        self.pool_size = pool_size
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.__sessions = queue.LifoQueue()     # 최근 사용한(따뜻한) 세션부터 꺼냄
+        self.__closed = False
+
+        for _ in range(pool_size):
+            self.__sessions.put((self._new_session(), time.monotonic()))
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount("https://", adapter)
+        return session
+
+    @contextmanager
+    def session(self):
+        """풀에서 세션을 하나 빌려오고 사용이 끝나면 반납한다"""
+        session, last_used = self.__sessions.get()
+        try:
+            # 서버가 먼저 끊었을 수 있는 유휴 커넥션은 버리고 새로 연결
+            if time.monotonic() - last_used > self.idle_timeout:
+                session.close()
+            yield session
+        finally:
+            if self.__closed:
+                session.close()
+            self.__sessions.put((session, time.monotonic()))
+
+    def warm_up(self, url=API_URL, timeout=3.0):
+        """모든 세션의 TCP+TLS 연결을 미리 맺어 둔다
+
+        Args:
+            url     (str  , optional): 연결할 주소
+            timeout (float, optional): 연결 대기 시간(초)
+        """
+        def _connect():
+            try:
+                with self.session() as session:
+                    session.head(url, timeout=timeout)
+            except Exception as x:
+                print("session warm up failed", x.__class__.__name__)
+
+        threads = [threading.Thread(target=_connect, daemon=True) for _ in range(self.pool_size)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout)
+
+    def close(self):
+        """풀의 모든 세션을 닫는다"""
+        self.__closed = True
+        while True:
+            try:
+                session, _ = self.__sessions.get_nowait()
+            except queue.Empty:
+                break
+            session.close()
+
+
+_session_pool = None
+_session_pool_lock = threading.Lock()
+
+
+def get_session_pool():
+    """
+    프로세스 전체에서 공유하는 세션 풀
+    :return: SessionPool
+    """
+    global _session_pool
+    if _session_pool is None:
+        with _session_pool_lock:
+            if _session_pool is None:
+                _session_pool = SessionPool()
+    return _session_pool
+
+
+def configure_session_pool(pool_size=8, pool_maxsize=4, idle_timeout=30.0, warm_up=False, timeout=DEFAULT_TIMEOUT):
+    """
+    공유 세션 풀을 새 설정으로 교체
+    :param pool_size: 동시에 사용할 수 있는 세션 수
+    :param pool_maxsize: 세션별 호스트당 유지할 커넥션 수
+    :param idle_timeout: 유휴 커넥션 재연결 기준 시간(초)
+    :param warm_up: True 이면 생성 직후 커넥션을 미리 맺음
+    :param timeout: 요청 대기 시간(초) (연결, 응답)
+    :return: SessionPool
+    """
+    global _session_pool
+    pool = SessionPool(pool_size=pool_size, pool_maxsize=pool_maxsize, idle_timeout=idle_timeout, timeout=timeout)
+    with _session_pool_lock:
+        old_pool, _session_pool = _session_pool, pool
+    if old_pool is not None:
+        old_pool.close()
+    if warm_up:
+        pool.warm_up()
+    return pool
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 요청을 한 번의 호출로 합쳐 결과를 공유
+
+        사용 예제:
+
+            >> flight = SingleFlight()
+            >> result = flight.do(('GET', url, params), lambda: _send_request('GET', url, params=params))
+
+        주의 :
+
+           먼저 들어온 호출(leader)은 원본을, 기다린 호출은 결과의 복사본을 받는다.
+           복사는 leader 가 결과를 받기 전에 떠 둔 스냅샷에서 하므로 leader 가 결과를 바꿔도 영향이 없다.
+           leader 에서 발생한 예외는 기다린 호출에도 그대로 전달된다.
+    """
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.frozen = None      # 기다린 호출에 나눠 줄 결과 스냅샷
+            self.error = None
+            self.waiters = 0
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+
+    def do(self, key, fn):
+        """
+        key 로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn() 을 실행
+        :param key: 요청을 구분하는 hashable 키
+        :param fn: 실제 요청 함수
+        :return: fn() 의 결과
+        """
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.__calls[key] = SingleFlight._Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.frozen)
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as x:
+            call.error = x
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+                waiters = call.waiters
+            # leader 의 호출자가 결과를 바꾸기 전에 스냅샷을 떠 둠 (키를 지웠으므로 waiters 는 더 늘지 않음)
+            if waiters and call.error is None:
+                call.frozen = copy.deepcopy(call.result)
+            call.done.set()
+
+
+_single_flight = SingleFlight()
+
+
+def _flight_key(method, url, params, account=None):
+    """
+    single flight 키 생성
+    :param method:
+    :param url:
+    :param params: 딕셔너리 또는 urlencode 된 문자열
+    :param account: private API 의 access key
+    :return:
+    """
+    if isinstance(params, dict):
+        params = urlencode(sorted(params.items()))
+    return method, url, params, account
+
 
 def _parse_remaining_req(remaining_req):
     """
@@ -19,6 +239,86 @@ def _parse_remaining_req(remaining_req):
         return None, None, None
 
 
+def _request_market(market, params, data):
+    """
+    스케줄러의 공정 분배 키로 쓸 마켓 코드
+    :param market: 호출한 쪽에서 지정한 마켓 코드
+    :param params: 쿼리 파라미터
+    :param data: 요청 본문
+    :return:
+    """
+    if market is not None:
+        return market
+    for values in (params, data):
+        if isinstance(values, dict):
+            market = values.get('market', values.get('markets'))
+            if market is not None:
+                return ",".join(market) if isinstance(market, list) else market
+    return None
+
+
+def _send_request(method, url, headers=None, priority=None, market=None, **kwargs):
+    """
+    요청 수 제한, 우선순위, 재시도 정책을 지키면서 공유 세션 풀을 통해 요청을 보낸다
+    에러 응답(4xx/5xx)은 errors.decode_error 로 변환한 예외를 발생시킨다
+    :param method: GET, POST, DELETE
+    :param url:
+    :param headers: 헤더 딕셔너리 또는 시도할 때마다 새 헤더를 만드는 함수 (JWT nonce 재발급용)
+    :param priority: 요청 우선순위 (None 이면 method/url 로 결정)
+    :param market: 같은 우선순위 안에서 공정하게 나눌 마켓 코드 (None 이면 파라미터에서 찾음)
+    :param kwargs: requests.Session.request 인자 (timeout 을 지정하지 않으면 세션 풀의 timeout 사용)
+    :return: requests.Response
+    """
+    limiter = get_rate_limiter()
+    pool = get_session_pool()
+    # 응답이 없으면 requests.Timeout 이 발생해서 재시도/서킷 브레이커가 동작하도록 항상 timeout 지정
+    kwargs.setdefault('timeout', pool.timeout)
+    group = limiter.group_for(method, url)
+    if priority is None:
+        priority = limiter.priority_for(method, url)
+    market = _request_market(market, kwargs.get('params'), kwargs.get('data'))
+
+    def attempt():
+        limiter.acquire(group, priority, market)
+        with pool.session() as session:
+            resp = session.request(method, url, headers=headers() if callable(headers) else headers, **kwargs)
+
+        remaining_req = resp.headers.get('Remaining-Req')
+        if remaining_req is not None:
+            actual_group, min, sec = _parse_remaining_req(remaining_req)
+            limiter.update(group, actual_group, min, sec, method=method, url=url)
+        if resp.status_code == 429:
+            limiter.penalize(group)
+        if resp.status_code >= 400:
+            # 에러 응답은 종류별 예외로 변환 (재시도 여부는 예외의 retryable 로 판단)
+            try:
+                contents = resp.json()
+            except ValueError:
+                contents = None
+            raise decode_error(resp.status_code, contents, resp.headers)
+        return resp
+
+    # 주문 생성(POST)은 멱등이 아니므로 서버에 도달하지 않은 경우에만 재시도
+    return get_retry_engine().call((method, urlparse(url).path), attempt, idempotent=method != 'POST')
+
+
+def _parse_response(resp):
+    """
+
+    :param resp:
+    :return: 응답 본문, Remaining-Req 딕셔너리
+    """
+    remaining_req_dict = {}
+    remaining_req = resp.headers.get('Remaining-Req')
+    if remaining_req is not None:
+        group, min, sec = _parse_remaining_req(remaining_req)
+        remaining_req_dict['group'] = group
+        remaining_req_dict['min'] = min
+        remaining_req_dict['sec'] = sec
+    contents = resp.json()
+    return contents, remaining_req_dict
+
+
 def _call_public_api(url, **kwargs):
     """
 
@@ -27,98 +327,74 @@ def _call_public_api(url, **kwargs):
     :return:
     """
     try:
-        resp = requests.get(url, params=kwargs)
-        remaining_req_dict = {}
-        remaining_req = resp.headers.get('Remaining-Req')
-        if remaining_req is not None:
-            group, min, sec = _parse_remaining_req(remaining_req)
-            remaining_req_dict['group'] = group
-            remaining_req_dict['min'] = min
-            remaining_req_dict['sec'] = sec
-        contents = resp.json()
-        return contents, remaining_req_dict
+        key = _flight_key('GET', url, kwargs)
+        return _single_flight.do(key, lambda: _parse_response(_send_request('GET', url, params=kwargs)))
+    except BithumbError:
+        raise
     except Exception as x:
         print("It failed", x.__class__.__name__)
         return None
 
 
-def _send_post_request(url, headers=None, data=None):
+def _send_post_request(url, headers=None, data=None, market=None):
     """
 
     :param url:
     :param headers:
     :param data:
+    :param market: 마켓 코드 (요청 스케줄링용)
     :return:
     """
     try:
-        resp = requests.post(url, data=data, headers=headers)
-        remaining_req_dict = {}
-        remaining_req = resp.headers.get('Remaining-Req')
-        if remaining_req is not None:
-            group, min, sec = _parse_remaining_req(remaining_req)
-            remaining_req_dict['group'] = group
-            remaining_req_dict['min'] = min
-            remaining_req_dict['sec'] = sec
-        contents = resp.json()
-        return contents, remaining_req_dict
+        resp = _send_request('POST', url, data=data, headers=headers, market=market)
+        return _parse_response(resp)
+    except BithumbError:
+        raise
     except Exception as x:
         print("send post request failed", x.__class__.__name__)
         print("caller: ", eval(getframe_expr.format(2)))
         return None
 
 
-def _send_get_request(url, headers=None, data=None):
+def _send_get_request(url, headers=None, data=None, account=None, market=None):
     """
 
     :param url:
     :param headers:
+    :param data:
+    :param account: access key (지정하면 같은 계정의 동일 요청을 하나로 합침)
+    :param market: 마켓 코드 (요청 스케줄링용)
     :return:
     """
-    retry_attempt = 0  # 재시도 횟수
-    max_retries = 1  # 최대 재시도 횟수
-    while retry_attempt <= max_retries:
-
-        try:
-            resp = requests.get(url, headers=headers, data=data)
-            remaining_req_dict = {}
-            remaining_req = resp.headers.get('Remaining-Req')
-            if remaining_req is not None:
-                group, min, sec = _parse_remaining_req(remaining_req)
-                remaining_req_dict['group'] = group
-                remaining_req_dict['min'] = min
-                remaining_req_dict['sec'] = sec
-            contents = resp.json()
-            return contents, remaining_req_dict
-        except Exception as x:
-            if retry_attempt < max_retries:
-                retry_attempt += 1
-                print(f"_send_get_request Request failed. Retrying {retry_attempt}/{max_retries}...")
-                time.sleep(3)  # 재시도 전 대기 시간 (필요시 조정 가능)
-            else:
-                print("send get request failed", x.__class__.__name__)
-                print("caller: ", eval(getframe_expr.format(2)))
-                return None
+    try:
+        if account is None:
+            return _parse_response(_send_request('GET', url, headers=headers, data=data, market=market))
+        key = _flight_key('GET', url, data, account)
+        return _single_flight.do(key, lambda: _parse_response(_send_request('GET', url, headers=headers, data=data,
+                                                                            market=market)))
+    except BithumbError:
+        raise
+    except Exception as x:
+        print("send get request failed", x.__class__.__name__)
+        print("caller: ", eval(getframe_expr.format(2)))
+        return None
 
 
-def _send_delete_request(url, headers=None, data=None):
+def _send_delete_request(url, headers=None, data=None, params=None, market=None):
     """
 
     :param url:
     :param headers:
     :param data:
+    :param params:
+    :param market: 마켓 코드 (요청 스케줄링용)
     :return:
     """
     try:
-        resp = requests.delete(url, headers=headers, data=data)
-        remaining_req_dict = {}
-        remaining_req = resp.headers.get('Remaining-Req')
-        if remaining_req is not None:
-            group, min, sec = _parse_remaining_req(remaining_req)
-            remaining_req_dict['group'] = group
-            remaining_req_dict['min'] = min
-            remaining_req_dict['sec'] = sec
-        contents = resp.json()
-        return contents, remaining_req_dict
+        resp = _send_request('DELETE', url, headers=headers, data=data, params=params, market=market)
+        return _parse_response(resp)
+    except BithumbError:
+        raise
     except Exception as x:
         print("send delete request failed", x.__class__.__name__)
         print("caller: ", eval(getframe_expr.format(2)))
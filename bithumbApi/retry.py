@@ -0,0 +1,294 @@
+# 재시도 정책 / 서킷 브레이커
+import asyncio
+import random
+import threading
+import time
+
+import requests
+
+from bithumbApi import errors
+
+# 재시도해도 되는 HTTP 상태 코드
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# 서버 장애로 보는 예외 (연결 실패, 응답 지연)
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+# 요청이 서버에 도달하지 않았음이 확실한 예외 (주문 생성처럼 멱등이 아닌 요청도 재시도 가능)
+CONNECT_ERRORS = (requests.ConnectTimeout,)
+
+
+class RetryPolicy:
+    """에러 종류별 재시도 여부와 대기 시간을 결정하는 정책
+
+        거래소 에러(errors.py)는 각 예외의 retryable 값을 따른다.
+        대기 시간은 지수 백오프 + full jitter 를 사용하고,
+        응답에 Retry-After / Remaining-Req 가 있으면 그 값을 우선한다.
+    """
+    def __init__(self, max_retries=2, base_delay=0.2, max_delay=3.0):
+        """
+        :param max_retries: 최대 재시도 횟수
+        :param base_delay: 첫 재시도 대기 시간(초)
+        :param max_delay: 최대 대기 시간(초)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable_error(self, error, idempotent=True, transient_errors=TRANSIENT_ERRORS,
+                           connect_errors=CONNECT_ERRORS):
+        """
+        예외가 재시도 대상인지 판단
+        :param error: 발생한 예외
+        :param idempotent: 같은 요청을 다시 보내도 안전한지 여부 (주문 생성은 False)
+        :param transient_errors: 일시적 장애로 보는 예외 타입
+        :param connect_errors: 요청이 전송되지 않았음이 확실한 예외 타입
+        :return: bool
+        """
+        if isinstance(error, errors.ServerError):
+            # 서버 오류는 요청이 처리되었을 수도 있으므로 멱등 요청만 재시도
+            return idempotent
+        if isinstance(error, errors.BithumbError):
+            return error.retryable
+        if idempotent:
+            return isinstance(error, transient_errors)
+        return isinstance(error, connect_errors)
+
+    def is_retryable_status(self, status, idempotent=True):
+        """
+        HTTP 상태 코드가 재시도 대상인지 판단
+        :param status: HTTP 상태 코드
+        :param idempotent: 같은 요청을 다시 보내도 안전한지 여부
+        :return: bool
+        """
+        if status == 429:
+            # 요청 수 초과는 서버가 처리하지 않은 요청이므로 항상 재시도 가능
+            return True
+        return idempotent and status in RETRYABLE_STATUS
+
+    def delay(self, attempt, headers=None):
+        """
+        재시도 전 대기 시간
+        :param attempt: 지금까지 재시도한 횟수 (0부터)
+        :param headers: 마지막 응답의 헤더 (없으면 None)
+        :return: 대기 시간(초)
+        """
+        if headers is not None:
+            retry_after = headers.get('Retry-After')
+            if retry_after is not None:
+                try:
+                    return min(float(retry_after), self.max_delay)
+                except ValueError:
+                    pass
+            remaining_req = headers.get('Remaining-Req')
+            if remaining_req is not None and 'sec=0' in remaining_req.replace(' ', ''):
+                # 이번 초의 요청 수를 다 쓴 경우 다음 초까지 대기
+                return 1.0
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """엔드포인트별 서킷 브레이커
+
+        closed    : 정상, 요청 허용
+        open      : 연속 실패가 failure_threshold 에 도달하면 reset_timeout 동안 요청을 즉시 실패
+        half-open : reset_timeout 이 지나면 시험 요청 1건만 허용, 성공하면 closed / 실패하면 다시 open
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.__lock = threading.Lock()
+
+    def allow(self):
+        """
+        요청을 보내도 되는지 확인
+        :return: bool
+        """
+        with self.__lock:
+            if self.state == CircuitBreaker.CLOSED:
+                return True
+            if self.state == CircuitBreaker.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CircuitBreaker.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self.__lock:
+            self.state = CircuitBreaker.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self.__lock:
+            self.failures += 1
+            if self.state == CircuitBreaker.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitBreaker.OPEN
+                self.opened_at = time.monotonic()
+
+
+class RetryEngine:
+    """재시도 정책과 엔드포인트별 서킷 브레이커를 적용해 요청 함수를 실행
+
+        사용 예제:
+
+            >> engine = get_retry_engine()
+            >> resp = engine.call(('GET', '/v1/accounts'), lambda: session.get(url, headers=headers))
+
+        주의 :
+
+           fn 은 호출될 때마다 새 요청을 보내야 한다. (JWT nonce 는 재시도마다 새로 만들어야 함)
+    """
+    def __init__(self, policy=None, failure_threshold=5, reset_timeout=10.0):
+        self.policy = policy if policy is not None else RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.__breakers = {}
+        self.__lock = threading.Lock()
+
+    def breaker(self, endpoint):
+        """
+        엔드포인트의 서킷 브레이커
+        :param endpoint: (method, path)
+        :return: CircuitBreaker
+        """
+        with self.__lock:
+            breaker = self.__breakers.get(endpoint)
+            if breaker is None:
+                breaker = self.__breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def _next_delay(self, breaker, attempt, idempotent, resp=None, error=None,
+                    transient_errors=TRANSIENT_ERRORS, connect_errors=CONNECT_ERRORS):
+        """
+        한 번의 시도 결과를 기록하고 재시도 대기 시간을 리턴
+        :return: 재시도 대기 시간(초), 재시도하지 않으면 None
+        """
+        if error is not None:
+            if isinstance(error, transient_errors) or isinstance(error, errors.ServerError):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            retryable = self.policy.is_retryable_error(error, idempotent, transient_errors, connect_errors)
+            headers = getattr(error, 'headers', None)
+        else:
+            status = resp.status_code
+            if status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            retryable = self.policy.is_retryable_status(status, idempotent)
+            headers = resp.headers
+
+        if not retryable or attempt >= self.policy.max_retries:
+            return None
+        return self.policy.delay(attempt, headers)
+
+    def call(self, endpoint, fn, idempotent=True):
+        """
+        fn() 을 실행하고 정책에 따라 재시도
+        :param endpoint: 서킷 브레이커 키 (method, path)
+        :param fn: 요청을 보내고 응답(status_code, headers 속성)을 리턴하는 함수
+        :param idempotent: 같은 요청을 다시 보내도 안전한지 여부
+        :return: 마지막 응답
+        """
+        breaker = self.breaker(endpoint)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise errors.CircuitOpen()
+            try:
+                resp = fn()
+            except Exception as x:
+                wait = self._next_delay(breaker, attempt, idempotent, error=x)
+                if wait is None:
+                    raise
+            else:
+                wait = self._next_delay(breaker, attempt, idempotent, resp=resp)
+                if wait is None:
+                    return resp
+            time.sleep(wait)
+            attempt += 1
+
+    async def call_async(self, endpoint, fn, idempotent=True, transient_errors=TRANSIENT_ERRORS,
+                         connect_errors=CONNECT_ERRORS):
+        """
+        call 의 asyncio 버전
+        :param endpoint: 서킷 브레이커 키 (method, path)
+        :param fn: 요청을 보내고 응답을 리턴하는 코루틴 함수
+        :param idempotent: 같은 요청을 다시 보내도 안전한지 여부
+        :param transient_errors: 일시적 장애로 보는 예외 타입
+        :param connect_errors: 요청이 전송되지 않았음이 확실한 예외 타입
+        :return: 마지막 응답
+        """
+        breaker = self.breaker(endpoint)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise errors.CircuitOpen()
+            try:
+                resp = await fn()
+            except Exception as x:
+                wait = self._next_delay(breaker, attempt, idempotent, error=x,
+                                        transient_errors=transient_errors, connect_errors=connect_errors)
+                if wait is None:
+                    raise
+            else:
+                wait = self._next_delay(breaker, attempt, idempotent, resp=resp)
+                if wait is None:
+                    return resp
+            await asyncio.sleep(wait)
+            attempt += 1
+
+
+_retry_engine = RetryEngine()
+
+
+def get_retry_engine():
+    """
+    프로세스 전체에서 공유하는 재시도 엔진
+    :return: RetryEngine
+    """
+    return _retry_engine
+
+
+if __name__ == "__main__":
+    # 응답 지연(requests.Timeout)은 GET 만 재시도하고 주문 생성(POST)은 재시도하지 않음
+    # (연결 단계의 ConnectTimeout 은 요청이 전송되지 않았으므로 POST 도 재시도)
+    def count_calls(endpoint, error, idempotent):
+        engine = RetryEngine(RetryPolicy(max_retries=2, base_delay=0, max_delay=0))
+        calls = []
+
+        def fn():
+            calls.append(1)
+            raise error
+
+        try:
+            engine.call(endpoint, fn, idempotent=idempotent)
+        except type(error):
+            pass
+        return len(calls)
+
+    assert count_calls(('GET', '/v1/ticker'), requests.ReadTimeout(), idempotent=True) == 3
+    assert count_calls(('GET', '/v1/ticker'), requests.Timeout(), idempotent=True) == 3
+    assert count_calls(('POST', '/v1/orders'), requests.ReadTimeout(), idempotent=False) == 1
+    assert count_calls(('POST', '/v1/orders'), requests.Timeout(), idempotent=False) == 1
+    assert count_calls(('POST', '/v1/orders'), requests.ConnectTimeout(), idempotent=False) == 3
+
+    # 연속 Timeout 은 서킷 브레이커를 연다
+    def stalled():
+        raise requests.ReadTimeout()
+
+    engine = RetryEngine(RetryPolicy(max_retries=0), failure_threshold=2)
+    for _ in range(2):
+        try:
+            engine.call(('GET', '/v1/ticker'), stalled)
+        except requests.ReadTimeout:
+            pass
+    assert engine.breaker(('GET', '/v1/ticker')).state == CircuitBreaker.OPEN
+    print("retry timeout ok")
@@ -2,12 +2,14 @@ import datetime
 import math
 import time
 import json
-from operator import itemgetter
+import threading
+from operator import attrgetter, itemgetter
 
 from requests import get
 
 from bithumbApi import exchange_api
 from bithumbApi import quotation_api
+from bithumbApi import price_grid
 
 logger = None
 isSpeedTradingStartYn = False  # 추세매매 시작/ 종료
@@ -16,6 +18,7 @@ myCoinNameList = []  # 현재 보유 코인 이름 목록
 mySelectCoinNameList = []  # 콤보박스 추가된 코인종목 리스트
 myTargetPriceList = []  # 코인별 코인별 거래간격,거래수량(%),분할갯수 리스트
 myWaitPriceList = []    # 현재 대기중인 매수/매도 리스트
+myWaitTicks = set()     # 현재 대기중인 매수/매도 가격의 호가 번호
 ipAddressFile = ""
 
 
@@ -34,17 +37,37 @@ def getIpConfig():
     return "bithumb_home.txt"
 
 
-# 업비트 로그인
+# 키 파일 경로 -> 로그인된 클라이언트 (세션 풀, 서명, 캐시를 계속 재사용)
+loginClients = {}
+loginClientsLock = threading.Lock()
+
+
+# 키 파일에서 access / secret 읽기
+def readLoginKey(fileName):
+    with open(fileName) as f:
+        lines = f.read().splitlines()
+    return lines[0], lines[1]
+
+
+# 업비트 로그인 (키 파일은 처음 한 번만 읽고 같은 클라이언트를 리턴)
 def login():
-    # 로그인 설정
-    f = open(ipAddressFile)
-    lines = f.read().splitlines()
-    access = lines[0]
-    secret = lines[1]
-    f.close()
+    logins = loginClients.get(ipAddressFile)
+    if logins is None:
+        with loginClientsLock:
+            logins = loginClients.get(ipAddressFile)
+            if logins is None:
+                access, secret = readLoginKey(ipAddressFile)
+                logins = loginClients[ipAddressFile] = exchange_api.bithumb(access, secret)
+
+    return logins
 
-    # 로그인
-    logins = exchange_api.bithumb(access, secret)
+
+# 키 변경시 키 파일을 다시 읽어 클라이언트 교체
+def rotateLogin():
+    access, secret = readLoginKey(ipAddressFile)
+    with loginClientsLock:
+        logins = loginClients[ipAddressFile] = exchange_api.bithumb(access, secret)
+    logger.info("로그인 키 재설정")
 
     return logins
 
@@ -53,6 +76,7 @@ def login():
 def getMarketCoins():
     objList = quotation_api.get_tickersObj("KRW")
 
+    marketCoinNameObj.clear()
     for i in objList:
         marketCoinNameObj.append(i)
 
@@ -77,6 +101,13 @@ def myKrwCoinHoldList():
 
 # 원화 마켓에 등록된 코인 영문명 리턴
 def getEngMarketCoinName(korCoinName):
+    try:
+        return quotation_api.get_market_cache().find_market(korCoinName, "KRW")
+    except Exception as x:
+        # 캐시 파일 없이 시작해서 마켓 목록 조회에 실패한 경우 저장해 둔 목록에서 찾음
+        print(x.__class__.__name__)
+        logger.info(x)
+
     for i in marketCoinNameObj:
         if i['korean_name'] == korCoinName:
             return str(i['market'])
@@ -94,13 +125,23 @@ def getKrwTarget():
     return krw_balance
 
 
+# 전략 대상 코인 전체를 가격 서비스에 등록 (한 번의 요청으로 함께 갱신)
+def watchTargetPrices():
+    quotation_api.get_price_service().watch([getEngMarketCoinName(i['coinName']) for i in myTargetPriceList])
+
+
+# 현재 코인 가격 (가격 서비스 캐시에서 읽음)
+def getCurrentPrice(krwEngCoinName):
+    return quotation_api.get_price_service().get(krwEngCoinName)
+
+
 # 콤보박스 선택 된 코인의 현재 가격 조회 리턴
 def gatCurrentPrice(coinName):
     # 코인명 영문명으로 변환
     krwEngCoinName = getEngMarketCoinName(coinName)
 
     # 현재 코인 가격
-    currentPrice = quotation_api.get_current_price(krwEngCoinName)
+    currentPrice = getCurrentPrice(krwEngCoinName)
 
     return str(currentPrice)
 
@@ -192,12 +233,13 @@ def sellSelectCoin(coinName):
 # 선택 종목 일괄 매수
 def buySelectCoin1():
     logger.info("buySelectCoin CALL !!!")
+    watchTargetPrices()
     for i in myTargetPriceList:
         # 코인명 영문명으로 변환
         krwEngCoinName = getEngMarketCoinName(i['coinName'])
 
         # 현재 코인 가격
-        currentPrice = quotation_api.get_current_price(krwEngCoinName)
+        currentPrice = getCurrentPrice(krwEngCoinName)
 
         bBuyVolume = 20000.0 / float(currentPrice)
 
@@ -219,7 +261,7 @@ def sellMyKrwItmList():
     for i in myBalancers:
         if i['currency'] != 'KRW':
             coinName = "KRW-" + i['currency']
-            btc_balance = login().get_balance(coinName)
+            btc_balance = float(i['balance'])
 
             # 코인 시장가 매도
             login().sell_market_order(coinName, btc_balance)
@@ -239,8 +281,7 @@ def sellMyKrwShareItmList():
         krwEngCoinName = getEngMarketCoinName(i['coinName'])
 
         # 현재 코인 가격
-        # currentPrice = quotation_api.get_current_price(krwEngCoinName)
-        time.sleep(0.1)  # API 요청시 요청 횟수 제한에 걸려 추가
+        # currentPrice = getCurrentPrice(krwEngCoinName)
 
         # sellPriceRange = get_price_range(currentPrice)
         currentPrice = i['currentPrice']  # 현재 가격
@@ -248,12 +289,13 @@ def sellMyKrwShareItmList():
         sellSharePrice = i['sellSharePrice']  # 분할매도가격
         sellBalance = i['sellBalance']  # 분할매도수량
         sellMaxCount = i['sellMaxCount']  # 분할 갯수
-        sellPriceRange = get_price_range(float(sellStartPrice))
+        # 매도시작가격에서 2호가 간격 (높은 가격부터)
+        limitPrices = price_grid.step_ticks(float(sellStartPrice), range(sellMaxCount * 2, 0, -2))
 
         # for i in range(sellMaxCount, 0, -1):
 
-        for y in range(sellMaxCount * 2, 0, -2):
-            limitPrice = round(float(sellStartPrice) + (sellPriceRange * y), 2)
+        orders = []
+        for y, limitPrice in zip(range(sellMaxCount * 2, 0, -2), price_grid.native(limitPrices)):
             # limitPrice = currentPrice + (sellPriceRange * (int(sellRange) * y))
             logger.info("****** 분할 매도******")
             logger.info("진 행 회 수 : " + str(y))
@@ -263,32 +305,15 @@ def sellMyKrwShareItmList():
             logger.info("매도 수량 : " + str(sellBalance))
             logger.info("****************************")
 
-            # 지정가 매도
-            login().sell_limit_order(krwEngCoinName, limitPrice, sellBalance)
-            time.sleep(0.2)
+            orders.append({'market': krwEngCoinName, 'side': 'ask', 'price': limitPrice, 'volume': sellBalance})
+
+        # 지정가 매도 (분할 주문 일괄 전송)
+        login().place_orders(orders)
 
 
 # 선택 종목 1호가 단위 리턴
 def get_price_range(price):
-    if price >= 2000000:
-        tick_range = 1000
-    elif price >= 1000000:
-        tick_range = 500
-    elif price >= 500000:
-        tick_range = 100
-    elif price >= 100000:
-        tick_range = 50
-    elif price >= 10000:
-        tick_range = 10
-    elif price >= 1000:
-        tick_range = 5
-    elif price >= 100:
-        tick_range = 1
-    elif price >= 10:
-        tick_range = 0.1
-    else:
-        tick_range = 0.01
-    return tick_range
+    return price_grid.tick_unit(price)
 
 
 # 지정가 매도
@@ -323,12 +348,13 @@ def buyLimitSelectCoin(coinName, limitPrice, limitVolume):
 def speedTradingStart():
     logger.info("speedTradingStart CALL !!!")
     while isSpeedTradingStartYn:
+        watchTargetPrices()
         for i in myTargetPriceList:
             # 코인명 영문명으로 변환
             krwEngCoinName = getEngMarketCoinName(i['coinName'])
 
             # 현재 코인 가격
-            currentPrice = quotation_api.get_current_price(krwEngCoinName)
+            currentPrice = getCurrentPrice(krwEngCoinName)
 
             sellPriceRange = get_price_range(currentPrice)
             sellRange = i['sellRange']  # 거래간격
@@ -384,12 +410,13 @@ def speedTradingStart():
 def speedTradingStart1():
     logger.info("speedTradingStart CALL !!!")
     while isSpeedTradingStartYn:
+        watchTargetPrices()
         for i in myTargetPriceList:
             # 코인명 영문명으로 변환
             krwEngCoinName = getEngMarketCoinName(i['coinName'])
 
             # 현재 코인 가격
-            currentPrice = float(quotation_api.get_current_price(krwEngCoinName))
+            currentPrice = float(getCurrentPrice(krwEngCoinName))
 
             if int(currentPrice) % 2 == 0:
                 sellPriceRange = get_price_range(currentPrice)
@@ -438,12 +465,13 @@ def speedTradingStart1():
 def speedTradingStart3():
     logger.info("speedTradingStart3 CALL !!!")
     while isSpeedTradingStartYn:
+        watchTargetPrices()
         for i in myTargetPriceList:
             # 코인명 영문명으로 변환
             krwEngCoinName = getEngMarketCoinName(i['coinName'])
 
             # 현재 코인 가격
-            currentPrice = quotation_api.get_current_price(krwEngCoinName)
+            currentPrice = getCurrentPrice(krwEngCoinName)
 
             sellPriceRange = get_price_range(currentPrice)
             sellRange = i['sellRange']  # 거래간격
@@ -507,6 +535,7 @@ def speedTradingStart3():
 def speedTradingStart4():
     logger.info("speedTradingStart4 CALL !!!")
     while isSpeedTradingStartYn:
+        watchTargetPrices()
         for i in myTargetPriceList:
             # 코인명 영문명으로 변환
             krwEngCoinName = getEngMarketCoinName(i['coinName'])
@@ -514,7 +543,7 @@ def speedTradingStart4():
             sellPriceRange = get_price_range(float(sellStartPrice))
 
             # 현재 코인 가격
-            currentPrice = quotation_api.get_current_price(krwEngCoinName)
+            currentPrice = getCurrentPrice(krwEngCoinName)
             isCWaitListFlag = isCheckWaitList(krwEngCoinName, currentPrice)
 
             sellRange = i['sellRange']  # 거래간격
@@ -547,23 +576,23 @@ def speedTradingStart4():
 def speedTradingStart5():
     logger.info("speedTradingStart5 CALL !!!")
     while isSpeedTradingStartYn:
+        watchTargetPrices()
         for i in myTargetPriceList:
             # 코인명 영문명으로 변환
             krwEngCoinName = getEngMarketCoinName(i['coinName'])
 
             # 현재 코인 가격
-            currentPrice = quotation_api.get_current_price(krwEngCoinName)
+            currentPrice = getCurrentPrice(krwEngCoinName)
             strCurrentPrice = str(currentPrice)
             lastString = strCurrentPrice[-1:]
 
             sellMaxCount = 11;
-            sellPriceRange = get_price_range(float(currentPrice))
             sellBalance = i['sellBalance']  # 분할매도수량
 
             if lastString != '5':
-                for y in range(sellMaxCount, 0, -1):
-                    checkRange = sellPriceRange * y
-                    sellPrice = round(currentPrice + checkRange, 2)
+                # 현재가에서 sellMaxCount 호가 위부터 1호가 위까지
+                sellPrices = price_grid.native(price_grid.step_ticks(currentPrice, range(sellMaxCount, 0, -1)))
+                for sellPrice in sellPrices:
                     isCWaitListFlag = isCheckWaitList(krwEngCoinName, sellPrice)
 
                     if (isCWaitListFlag is False):  # 등록되지않았다면
@@ -574,8 +603,6 @@ def speedTradingStart5():
                         logger.info("매수 수량 : " + str(sellBalance))
                         logger.info("****************************")
 
-                        time.sleep(1);
-
             time.sleep(9);
 
 
@@ -583,6 +610,7 @@ def speedTradingStart5():
 def speedTradingStart6():
     logger.info("speedTradingStart6 CALL !!!")
     while isSpeedTradingStartYn:
+        watchTargetPrices()
         for i in myTargetPriceList:
 
             korCoinName = i['coinName']
@@ -593,7 +621,7 @@ def speedTradingStart6():
             btc_balance = login().get_balance(krwEngCoinName)
 
             # 현재 코인 가격
-            currentPrice = quotation_api.get_current_price(krwEngCoinName)
+            currentPrice = getCurrentPrice(krwEngCoinName)
             # logger.info("******* 10초 주기 실행 *******")
             # logger.info("현재가격 : " + str(currentPrice))
             # logger.info("****************************")
@@ -620,12 +648,14 @@ def speedTradingStart6():
 
                 if minAskPrice > 0:
 
-                    for i in range(sellCount):
-                        sellPrice = minAskPrice - i - 1
+                    # 제일 낮은 매도 가격 1호가 아래부터 내려가며 (확인할 가격은 거래간격만큼 더 아래)
+                    sellPrices = price_grid.ladder(minAskPrice, sellCount, step=-1)
+                    checkPrices = price_grid.step_ticks(sellPrices, -sellRange)
+
+                    orders = []
+                    for sellPrice, checkPrice in zip(price_grid.native(sellPrices), price_grid.native(checkPrices)):
                         # bSellVolume = round(20000 / (sellPrice-1), 8)
 
-                        time.sleep(1)
-                        factor = 10 ** 8
                         # 4만원 이하면 전액 매도
                         if sellShare <= krw_price <= 40000:
                             #krw_price = math.floor((krw_price + 50) * factor) / factor
@@ -636,19 +666,22 @@ def speedTradingStart6():
                             #bSellVolume = math.floor((sellShare / sellPrice) * factor) / factor
                             logger.info("sellCount : " + str(sellCount))
                             if sellCount > 1:
-                                bSellVolume = math.floor((btc_balance / sellCount) * factor) / factor
+                                bSellVolume = price_grid.quantize_volume(btc_balance / sellCount)
 
-                        isSWaitListFlag = isCheckWaitList(krwEngCoinName, float(sellPrice - sellRange))
+                        isSWaitListFlag = isCheckWaitList(krwEngCoinName, float(checkPrice))
                         if isSWaitListFlag is False:  # 등록되지않았다면
                             if bSellVolume > 1:
                                 # 지정가 매도
-                                login().sell_limit_order(krwEngCoinName, sellPrice, bSellVolume)
+                                orders.append({'market': krwEngCoinName, 'side': 'ask', 'price': sellPrice,
+                                               'volume': bSellVolume})
 
                                 logger.info("****** 지정가 매도 ******")
                                 logger.info("매도 호가 : " + str(sellPrice))
                                 logger.info("매도 수량 : " + str(bSellVolume))
                                 logger.info("****************************")
 
+                    login().place_orders(orders)
+
             # 업비트 현재 남아 있는 원화 전체 금액 가져 옴
             krw_balance =  math.floor(login().get_balance("KRW"))
 
@@ -668,47 +701,54 @@ def speedTradingStart6():
 
                 if minBidPrice > 0:
 
-                    for i in range(buyCount):
-                        buyPrice = minBidPrice + i + 1
+                    # 제일 높은 매수 가격 1호가 위부터 올라가며 (확인할 가격은 거래간격만큼 더 위)
+                    buyPrices = price_grid.ladder(minBidPrice, buyCount, step=1)
+                    checkPrices = price_grid.step_ticks(buyPrices, sellRange)
+
+                    orders = []
+                    for buyPrice, checkPrice in zip(price_grid.native(buyPrices), price_grid.native(checkPrices)):
                         # bBuyVolume = round(20000 / buyPrice, 8)
 
-                        time.sleep(1)
-                        factor = 10 ** 8
                         # 4만원 이하면 전액 매수
                         if sellShare <= krw_balance <= 40000:
                             krw_balance = krw_balance * 0.9974
-                            bBuyVolume = math.floor((krw_balance / buyPrice) * factor) / factor
+                            bBuyVolume = price_grid.quantize_volume(krw_balance / buyPrice)
                             logger.info("3만원 미만 매수 수량 : " + str(bBuyVolume))
                         else:
                             #bBuyVolume = math.floor((sellShare / buyPrice) * factor) / factor
                             if buyCount > 1:
                                 krw_balance1 = (krw_balance * 0.9974) / buyCount
                                 logger.info("1호가 가격 : " + str(krw_balance1))
-                                bBuyVolume = math.floor((krw_balance1 / buyPrice) * factor) / factor
+                                bBuyVolume = price_grid.quantize_volume(krw_balance1 / buyPrice)
 
-                        isSWaitListFlag = isCheckWaitList(krwEngCoinName, float(buyPrice + sellRange))
+                        isSWaitListFlag = isCheckWaitList(krwEngCoinName, float(checkPrice))
                         if isSWaitListFlag is False:  # 등록되지않았다면
                             if bBuyVolume > 1:
                                 # 지정가 매수
-                                login().buy_limit_order(krwEngCoinName, buyPrice, bBuyVolume)
+                                orders.append({'market': krwEngCoinName, 'side': 'bid', 'price': buyPrice,
+                                               'volume': bBuyVolume})
 
                                 logger.info("****** 지정가 매수 ******")
                                 logger.info("매수 호가 : " + str(buyPrice))
                                 logger.info("매수 수량 : " + str(bBuyVolume))
                                 logger.info("****************************")
 
+                    login().place_orders(orders)
+
             time.sleep(10)
 
 # 현재 대기중인 매수/매도 목록 체크
 def isCheckDoneList(doneList):
     afterUuidList = []
+    # 완료된 주문 상세를 한 번에 조회 (완료 주문은 캐시에서 바로 리턴)
+    orderList = login().get_individual_orders([val['uuid'] for val in doneList])
     for index, val in enumerate(doneList):
         if index == 0:
-            uuidList = login().get_order(val['uuid'])
+            uuidList = orderList[index]
             tempList = uuidList['trades']
             afterUuidList = tempList[0]
         else:
-            uuidList = login().get_order(val['uuid'])
+            uuidList = orderList[index]
             tempList = uuidList['trades']
             tempList = tempList[0]
             strDate = str(tempList['created_at'])
@@ -732,23 +772,50 @@ def changeDateTime(strTime):
     return data_time_obj
 
 # 현재 대기중인 매도/매수 리스트 세팅
-def setWaitPriceList(coinName):
-    global myWaitPriceList  # 글로벌 변수 사용을 선언
+def setWaitPriceList(coinName, keep_raw=False):
+    global myWaitPriceList, myWaitTicks  # 글로벌 변수 사용을 선언
     if myWaitPriceList:
         myWaitPriceList.clear()
 
     # 영문 코인명 세팅
     engCoinName = getEngMarketCoinName(coinName)
 
-    # 대기중인 주문 목록 가져오기
-    myWaitPriceList = login().get_order(engCoinName, "wait", "watch", '100')
+    # 대기중인 주문 목록 가져오기 (100개 이상이면 다음 페이지까지)
+    # (keep_raw 이면 파일 저장용으로 응답 필드 전체 보관)
+    myWaitPriceList = list(login().iter_orders(engCoinName, "wait", "watch", keep_raw=keep_raw))
+    myWaitTicks = {orderTick(i) for i in myWaitPriceList}
+
+
+# 가격 -> 호가 번호 ("700", "700.0", 700 은 모두 같은 번호)
+def priceTick(price):
+    return price_grid.price_to_tick(float(price))
+
+
+# 주문 가격의 호가 번호 (OrderRecord 는 변환해 둔 값 사용)
+def orderTick(order):
+    if isinstance(order, exchange_api.OrderRecord) and order.tick is not None:
+        return order.tick
+    return priceTick(order['price'])
+
+
+# 주문 비교 키 (호가 번호, 매수/매도)
+def orderKey(order):
+    return orderTick(order), order['side']
+
+
+# (호가 번호, 매수/매도) -> 주문 (같은 키는 앞의 주문 사용)
+def indexOrdersByTick(orders):
+    index = {}
+    for order in orders:
+        index.setdefault(orderKey(order), order)
+    return index
 
 
 # 현재 대기중인 매도/매수 리스트 에서 MIN 가격 리턴
 def getAskBidWaitListPrice(krwEngCoinName, flag, type):
     #waitList = login().get_order(krwEngCoinName, "wait", "watch", '100')
 
-    waitList = sorted(myWaitPriceList, reverse=flag, key=lambda price: price["price"])
+    waitList = sorted(myWaitPriceList, reverse=flag, key=orderTick)
 
     if type == str('bid'):
         checkList = [item for item in waitList if str(item['side']) == ('ask')]
@@ -773,20 +840,16 @@ def getAskBidWaitListPrice(krwEngCoinName, flag, type):
 def isCheckWaitList(krwEngCoinName, checkPrice):
     #waitList = login().get_order(krwEngCoinName, "wait", "watch", '100')
 
-    for i in myWaitPriceList:
-        # logger.info("거래대기리스트 : " + str(i['price']))
-        if float(i['price']) == float(checkPrice):
-            return True
-
-    return False
+    return priceTick(checkPrice) in myWaitTicks
 
 # 거래완료 리스목록에서 포함 유무
 def isUseDoneList(krwEngCoinName, checkPrice):
     doneList = login().get_order(krwEngCoinName, "done", "watch", '3')
 
+    checkTick = priceTick(checkPrice)
     for i in doneList:
         logger.info("거래완료리스트 : " + str(i['price']))
-        if float(i['price']) == float(checkPrice):
+        if priceTick(i['price']) == checkTick:
             return True
 
     return False
@@ -800,13 +863,12 @@ def askBidWaitListSort():
         sellSharePrice = int(i['sellSharePrice'])  # 분할매도가격
 
         # 대기 리스트 조회
-        waitPriceList = login().get_order(krwEngCoinName, "wait", "watch", '100')
+        waitPriceList = list(login().iter_orders(krwEngCoinName, "wait", "watch"))
 
         # 거래대기리스트를 가격 기준 낮은가격이 위로 정렬
-        waitCancelList = sorted(waitPriceList, reverse=False, key=lambda price: price["price"])
-        # 매수리스트 주문취소 (낮은금액첫번째아이템삭제)
-        login().cancel_order(str(waitCancelList[0]['uuid']))
-        time.sleep(1)
+        waitCancelList = sorted(waitPriceList, reverse=False, key=orderTick)
+        # 매수리스트 주문취소 대상 (낮은금액첫번째아이템삭제)
+        lowestUuid = str(waitCancelList[0]['uuid'])
         waitCancelList.pop(0)
 
         # 매수만 필터링
@@ -814,18 +876,20 @@ def askBidWaitListSort():
         bidLastPrice=cancelList[0]['price']
 
         # 거래대기리스트를 가격 기준 높은가격이 위로 정렬
-        waitBuylList = sorted(waitPriceList, reverse=True, key=lambda price: price["price"])
-        # 매도리스트 주문취소 (높은금액첫번째아이템삭제)
-        login().cancel_order(str(waitBuylList[0]['uuid']))
-        time.sleep(1)
+        waitBuylList = sorted(waitPriceList, reverse=True, key=orderTick)
+        # 매도리스트 주문취소 대상 (높은금액첫번째아이템삭제)
+        highestUuid = str(waitBuylList[0]['uuid'])
         waitBuylList.pop(0)
 
+        # 양 끝 주문 동시 취소
+        login().cancel_orders([lowestUuid, highestUuid])
+
         # 매도만 필터링
         buyList = [item for item in waitBuylList if str(item['side']) == 'ask']
         askLastPrice=buyList[0]['price']
 
-        # 파일에서 기존 데이터 읽기
-        existing_orders = read_orders_from_file()
+        # 파일에서 기존 데이터 읽기 (호가 번호로 한 번만 색인)
+        existing_orders = indexOrdersByTick(read_orders_from_file())
 
         logger.info('total SIZE: ' + str(len(cancelList)))
         # 매수리스트가 50개보다 클  경우
@@ -833,9 +897,13 @@ def askBidWaitListSort():
             logger.info('매수리스트 갯수 : ' + str(len(cancelList)))
             gap = len(cancelList) - 50
 
+            cancelUuids = []
             for i in range(gap):
                 #마지막이면
                 if i == gap - 1:
+                    # 앞의 주문들을 먼저 일괄 취소
+                    login().cancel_orders(cancelUuids)
+
                     # 업비트 현재 매도 가능한 수량 리턴
                     btc_balance = login().get_balance(krwEngCoinName)
 
@@ -850,8 +918,7 @@ def askBidWaitListSort():
                     logger.info('매수리스트가 50개보다 큼 주문취소')
 
                     # 매수리스트 주문취소 (낮은금액부터삭제)
-                    login().cancel_order(str(cancelList[i]['uuid']))
-                    time.sleep(1)
+                    cancelUuids.append(str(cancelList[i]['uuid']))
 
         # 매수리스트가 50개보다 작을 경우
         elif len(cancelList) < 50:
@@ -859,22 +926,27 @@ def askBidWaitListSort():
             gap = 50 - len(cancelList)
 
             logger.info('GAP : ' + str(gap))
+            # 마지막 매수 가격 1호가 아래부터 gap - 1 개 가격과 수량
+            buyPrices = price_grid.ladder(float(bidLastPrice), gap - 1, step=-1)
+            buyVolumes = price_grid.quantize_volume(sellSharePrice / buyPrices)
+            orders = []
             for i in range(gap):
                 if i == gap - 1:
+                    # 분할 매수 주문을 먼저 일괄 전송
+                    login().place_orders(orders)
+
                     # 업비트 현재 남아 있는 원화 전체 금액 가져 옴
                     krw_balance = login().get_balance("KRW")
 
                     krw_balance = krw_balance * 0.9974  # 수수료 0.05% 고려
-                    factor = 10 ** 8
-                    bBuyVolume = math.floor((krw_balance / 100) * factor) / factor
+                    bBuyVolume = price_grid.quantize_volume(krw_balance / 100)
                     logger.info("전체 매수 수량 : " + str(bBuyVolume))
 
                     # 지정가 매수
                     login().buy_limit_order(krwEngCoinName, 100, bBuyVolume)
                 else:
-                    buyPrice = int(bidLastPrice) - i - 1
-                    factor = 10 ** 8
-                    bBuyVolume = math.floor((sellSharePrice / buyPrice) * factor) / factor
+                    buyPrice = price_grid.native(buyPrices[i])
+                    bBuyVolume = buyVolumes[i].item()
 
                     # volume 값 검색
                     volume = get_volume_by_price_in_updated_orders(existing_orders, buyPrice, target_type='bid')
@@ -887,17 +959,20 @@ def askBidWaitListSort():
                     logger.info('매수리스트가 50개보다 작음 지정가 매수')
 
                     # 지정가 매수
-                    login().buy_limit_order(krwEngCoinName, buyPrice, bBuyVolume)
-                    time.sleep(1)
+                    orders.append({'market': krwEngCoinName, 'side': 'bid', 'price': buyPrice, 'volume': bBuyVolume})
 
         # 매도리스트가 48개보다 클 경우
         if len(buyList) > 48:
             logger.info('매도리스트 갯수 : ' + str(len(buyList)))
             gap = len(buyList) - 48
 
+            cancelUuids = []
             for i in range(gap):
                 #마지막이면
                 if i == gap - 1:
+                    # 앞의 주문들을 먼저 일괄 취소
+                    login().cancel_orders(cancelUuids)
+
                     # 업비트 현재 매도 가능한 수량 리턴
                     btc_balance = login().get_balance(krwEngCoinName)
 
@@ -913,8 +988,7 @@ def askBidWaitListSort():
                     logger.info('매도리스트가 48개보다 큼 높은가격부터 취소')
 
                     # 매도리스트 주문취소 (높믄가격부터 취소)
-                    login().cancel_order(str(waitBuylList[i]['uuid']))
-                    time.sleep(1)
+                    cancelUuids.append(str(waitBuylList[i]['uuid']))
 
         # 매도리스트가 48개보다 작을 경우
         elif len(buyList) < 48:
@@ -922,8 +996,15 @@ def askBidWaitListSort():
             gap = 48 - len(buyList)
 
             logger.info('GAP : ' + str(gap))
+            # 마지막 매도 가격 1호가 위부터 gap - 1 개 가격과 수량
+            sellPrices = price_grid.ladder(float(askLastPrice), gap - 1, step=1)
+            sellVolumes = price_grid.quantize_volume(sellSharePrice / price_grid.step_ticks(sellPrices, -2))
+            orders = []
             for i in range(gap):
                 if i == gap - 1:
+                    # 분할 매도 주문을 먼저 일괄 전송
+                    login().place_orders(orders)
+
                     # 업비트 현재 매도 가능한 수량 리턴
                     btc_balance = login().get_balance(krwEngCoinName)
 
@@ -931,9 +1012,8 @@ def askBidWaitListSort():
                     login().sell_limit_order(krwEngCoinName, 700, btc_balance)
                     logger.info("전체 매도 수량 : " + str(btc_balance))
                 else:
-                    sellPrice = int(askLastPrice) + i + 1
-                    factor = 10 ** 8
-                    bSellVolume = math.floor((sellSharePrice / (sellPrice - 2)) * factor) / factor
+                    sellPrice = price_grid.native(sellPrices[i])
+                    bSellVolume = sellVolumes[i].item()
 
                     # volume 값 검색
                     volume = get_volume_by_price_in_updated_orders(existing_orders, sellPrice, target_type='ask')
@@ -946,8 +1026,7 @@ def askBidWaitListSort():
                     logger.info('매도리스트가 48개보다 작음 지정가 매도')
 
                     # 지정가 매도
-                    login().sell_limit_order(krwEngCoinName, sellPrice, bSellVolume)
-                    time.sleep(1)
+                    orders.append({'market': krwEngCoinName, 'side': 'ask', 'price': sellPrice, 'volume': bSellVolume})
 
 # 주문 대기 리스트 파일로 저장
 def save_orders_to_file(korCoinName):
@@ -956,11 +1035,11 @@ def save_orders_to_file(korCoinName):
     # 코인명 영문명으로 변환
     krwEngCoinName = getEngMarketCoinName(korCoinName)
 
-    # 대기중인 주문 목록 가져오기
-    orders = login().get_order(krwEngCoinName, "wait", "watch", '100')
+    # 대기중인 주문 목록 가져오기 (파일에는 응답 필드 전체 저장)
+    orders = list(login().iter_orders(krwEngCoinName, "wait", "watch", record=False))
 
     # 거래대기리스트를 가격 기준 높은가격이 위로 정렬
-    sortdata = sorted(orders, reverse=True, key=lambda price: price["price"])
+    sortdata = sorted(orders, reverse=True, key=orderTick)
 
     if sortdata:
         with open(filename, 'w') as f:
@@ -974,8 +1053,8 @@ def save_orders_update_to_file(korCoinName):
     # 파일에서 기존 데이터 읽기
     existing_orders = read_orders_from_file()
 
-    # 대기 리스트 업데이트
-    setWaitPriceList(korCoinName)
+    # 대기 리스트 업데이트 (파일 형식이 바뀌지 않도록 응답 필드 전체 보관)
+    setWaitPriceList(korCoinName, keep_raw=True)
 
     # 데이터 비교 및 업데이트
     updated_orders = update_data(existing_orders, myWaitPriceList)
@@ -1002,15 +1081,16 @@ def read_orders_from_file():
 # 데이터 업데이트 함수
 def update_data(existing_data, new_data):
     updated_data = existing_data.copy()
-    prices_and_sides = {(item['price'], item['side']) for item in updated_data}  # 기존 데이터의 (price, side) 집합
+    positions = {}  # 기존 데이터의 (호가 번호, side) -> 위치 목록
+    for n, item in enumerate(updated_data):
+        positions.setdefault(orderKey(item), []).append(n)
 
     for item in new_data:
-        if (item['price'], item['side']) in prices_and_sides:
+        key = orderKey(item)
+        if key in positions:
             # 동일한 price와 side가 있는 경우 기존 데이터 교체
-            updated_data = [
-                i if not (i['price'] == item['price'] and i['side'] == item['side']) else item
-                for i in updated_data
-            ]
+            for n in positions[key]:
+                updated_data[n] = item
             # 가격과 side가 동일한 항목을 교체했을 때 로그 찍기
             #logger.info(f'기존 데이터의 price {item["price"]}와 side {item["side"]}가 교체되었습니다.')
         else:
@@ -1025,11 +1105,11 @@ def save_to_json_file(data):
     filename = 'completed_orders.json'
 
     # 거래대기리스트를 가격 기준 높은가격이 위로 정렬
-    sortdata = sorted(data, reverse=True, key=lambda price: price["price"])
+    sortdata = sorted(data, reverse=True, key=orderTick)
 
     try:
         with open(filename, 'w') as file:
-            json.dump(sortdata, file, indent=4)
+            json.dump(sortdata, file, indent=4, default=attrgetter('raw'))
         logger.info('파일 저장 성공')
     except Exception as e:
         logger.info('파일 저장 중 오류 발생')
@@ -1039,13 +1119,16 @@ def save_to_json_file(data):
 def get_volume_by_price_in_updated_orders(updated_orders, target_price, target_type):
     """
     updated_orders에서 target_price에 해당하는 volume 값을 반환합니다.
+    updated_orders 는 주문 리스트 또는 indexOrdersByTick 결과 (반복 조회할 때는 색인을 넘김)
     """
-    for order in updated_orders:
-        if (float(order.get('price')) == float(target_price) and
-                order.get('side') == str(target_type)):  # price와 type을 비교
-            volume = order.get('volume')
-            logger.info("변경된 수량 : " + str(volume))
-            return order.get('volume')  # volume 값 반환
+    if not isinstance(updated_orders, dict):
+        updated_orders = indexOrdersByTick(updated_orders)
+
+    order = updated_orders.get((priceTick(target_price), str(target_type)))  # price와 type을 비교
+    if order is not None:
+        volume = order.get('volume')
+        logger.info("변경된 수량 : " + str(volume))
+        return order.get('volume')  # volume 값 반환
 
     # 값이 없을 경우 None 반환
     return None
\ No newline at end of file
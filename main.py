@@ -10,7 +10,7 @@ from PyQt5.QtCore import *
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import *
 
-from bithumbApi import trading_api, exchange_api, quotation_api
+from bithumbApi import trading_api, exchange_api, quotation_api, request_api, candle_store
 
 
 
@@ -112,12 +112,16 @@ class MainWidget(QWidget):
         # 로그 사용을 위하 세팅
         trading_api.logger = logger
         exchange_api.logger = logger
-        quotation_api.loggr = logger
+        quotation_api.logger = logger
+        candle_store.logger = logger
 
         # 업비트 인증키 세팅 파일명 세팅
         #trading_api.ipAddressFile = trading_api.getIpConfig()
         trading_api.ipAddressFile = resource_path('bithumb_home.txt')
 
+        # API 서버 커넥션 미리 연결
+        request_api.configure_session_pool(pool_size=8, warm_up=True)
+
         # 원화마켓에 등록된 코인 전체 목록 세팅
         trading_api.getMarketCoins()
 